@@ -2,11 +2,18 @@
 
 import streamlit as st
 import sys
+import functools
+import hashlib
+import importlib
 import os
+import io
 from pathlib import Path
+from typing import Optional
 import shutil
 import time
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the project root to the path so we can import yt2txt modules
 # Try to handle path issues more safely
@@ -19,19 +26,40 @@ except Exception:
     pass
 
 # Import modules - if any fail, the app will show an error
+# Modules that pull in yt-dlp, openai or tqdm are loaded on first use via _lazy()
 from yt2txt.config import Config
-from yt2txt.downloader import download_audio
-from yt2txt.video_downloader import download_video
-from yt2txt.transcriber import transcribe_audio
-from yt2txt.analyzer import analyze_transcript
-from yt2txt.writers.txt_writer import write_txt
-from yt2txt.writers.json_writer import write_json
-from yt2txt.writers.srt_writer import write_srt
+from yt2txt.writers.transcript_files import write_transcript_files
 from yt2txt.writers.analysis_writer import write_analysis
-from yt2txt.formatter import format_transcript
-from yt2txt.models import Transcript, Segment
-import json
+from yt2txt.models import Transcript, Segment, SEGMENT_FIELDS, minutes_label
 import re
+import orjson
+
+
+@functools.lru_cache(maxsize=None)
+def _lazy(name: str):
+    """
+    Import a yt2txt module the first time it is needed.
+    Keeps yt-dlp, openai and tqdm imports off the first page render.
+    """
+    return importlib.import_module(name)
+
+
+# Escapes "$" so st.markdown doesn't treat dollar amounts as LaTeX (one C pass via str.translate)
+_DOLLAR_ESCAPE_TABLE = str.maketrans({"$": "\\$"})
+
+# Patterns used by fix_number_formatting (compiled once at import)
+_RE_TAG = re.compile(r'<[^>]+>')
+_RE_DIGIT = re.compile(r'\d')
+# One alternation, tried in priority order at each position:
+# number range, number + scale word, standalone number (2+ digits)
+_RE_NUMBER_TOKEN = re.compile(
+    r'(?P<range>(?P<low>\d+)\s+to\s+(?P<high>\d+)'
+    r'(?:\s*(?P<range_unit>million|billion|trillion|thousand|hundred|per\s+\w+))?)'
+    r'|(?P<scale>(?:(?P<currency>[$€£])\s*)?(?P<amount>\d+[\d,\s.]*)\s+'
+    r'(?P<scale_unit>million|billion|trillion|thousand|hundred))'
+    r'|\b(?P<number>\d{2,}[\d,.]*)\b',
+    re.IGNORECASE
+)
 
 
 # Page configuration
@@ -44,8 +72,12 @@ st.set_page_config(
 
 # Load secrets from Streamlit Cloud and update Config
 # This happens AFTER page config when st.secrets is safe to access
+@st.cache_resource(show_spinner=False)
 def load_streamlit_secrets():
-    """Load secrets from Streamlit Cloud into Config."""
+    """
+    Load secrets from Streamlit Cloud into Config.
+    Config is process-wide, so this runs once per server process rather than on every rerun.
+    """
     try:
         if not hasattr(st, 'secrets'):
             return
@@ -81,6 +113,37 @@ def load_streamlit_secrets():
 
 load_streamlit_secrets()
 
+
+@st.cache_resource
+def start_client_warm_up(api_key: str) -> None:
+    """
+    Warm the shared OpenAI client's connection pool in the background.
+    Cached per API key so it runs once per server process, not once per rerun.
+    """
+    # The openai import happens on this thread too, off the first render
+    threading.Thread(target=lambda: _lazy("yt2txt.client").warm_up_client(), daemon=True).start()
+
+
+start_client_warm_up(Config.OPENAI_API_KEY)
+
+
+@st.cache_resource
+def get_chat_client(api_key: str):
+    """
+    OpenAI client for the Chat tab, shared across reruns and sessions.
+    Built on the shared yt2txt client so it reuses the warmed connection pool.
+    """
+    return _lazy("yt2txt.client").get_openai_client().with_options(timeout=300.0)
+
+
+@st.cache_resource
+def get_background_pool() -> ThreadPoolExecutor:
+    """
+    Worker pool for long GPT calls (analysis, formatting), shared across sessions.
+    Jobs outlive the script run that started them, so a rerun doesn't cancel them.
+    """
+    return ThreadPoolExecutor(max_workers=4)
+
 # Custom CSS for better styling
 st.markdown("""
     <style>
@@ -150,10 +213,22 @@ if 'processing' not in st.session_state:
     st.session_state.processing = False
 if 'transcript_history' not in st.session_state:
     st.session_state.transcript_history = []  # List of (video_id, title, url, transcript_path)
+if 'transcript_history_ids' not in st.session_state:
+    st.session_state.transcript_history_ids = set()  # video_ids in transcript_history
 if 'current_video_url' not in st.session_state:
     st.session_state.current_video_url = None
 
 
+# Number of transcript lines shown in the live preview while transcribing
+PREVIEW_MAX_LINES = 20
+
+# Minimum seconds between re-renders of a streaming chat answer
+STREAM_RENDER_INTERVAL = 0.1
+
+# Seconds between reruns that check on a running Analysis/Format task
+BACKGROUND_POLL_INTERVAL = 0.5
+
+
 def transcribe_with_progress(audio_path: Path, video_id: str, url: str, metadata: dict, force: bool = False):
     """
     Transcribe audio with a progress bar showing estimated progress.
@@ -161,7 +236,7 @@ def transcribe_with_progress(audio_path: Path, video_id: str, url: str, metadata
     - File upload time (estimated from file size)
     - Processing time (estimated from audio duration)
     """
-    from yt2txt.transcriber import transcribe_audio
+    transcribe_audio = _lazy("yt2txt.transcriber").transcribe_audio
     
     # Get file size and duration for estimation
     file_size_mb = audio_path.stat().st_size / (1024 * 1024)
@@ -196,11 +271,24 @@ def transcribe_with_progress(audio_path: Path, video_id: str, url: str, metadata
     result = None
     error_occurred = None
     
+    # Finished chunks are handed back through a queue - Streamlit calls must stay on this thread
+    chunk_queue = queue.Queue()
+    preview_container = st.empty()
+    preview_chunks = {}  # chunk_num -> formatted lines, rendered in chunk order
+    completed_chunks = 0
+    total_chunks = 1
+    
+    def on_chunk_complete(chunk_num, chunk_count, segments):
+        chunk_queue.put((chunk_num, chunk_count, segments))
+    
     # Run transcription in a thread so we can update progress
     def run_transcription():
         nonlocal result, error_occurred
         try:
-            result = transcribe_audio(audio_path, video_id, url, metadata, force=force)
+            result = transcribe_audio(
+                audio_path, video_id, url, metadata, force=force,
+                on_chunk_complete=on_chunk_complete
+            )
         except Exception as e:
             error_occurred = e
     
@@ -226,6 +314,20 @@ def transcribe_with_progress(audio_path: Path, video_id: str, url: str, metadata
             # Fallback: linear progress if we can't estimate
             progress = min_progress + (max_progress - min_progress) * min(elapsed / 60, 0.95)
         
+        # Show segments from chunks that have finished so far
+        new_segments = False
+        while not chunk_queue.empty():
+            chunk_num, total_chunks, segments = chunk_queue.get_nowait()
+            completed_chunks += 1
+            preview_chunks[chunk_num] = [f"{minutes_label(seg.start)} {seg.text}" for seg in segments]
+            new_segments = True
+        if new_segments:
+            preview_lines = [line for num in sorted(preview_chunks) for line in preview_chunks[num]]
+            preview_container.text("\n".join(preview_lines[-PREVIEW_MAX_LINES:]))
+        if completed_chunks:
+            chunk_progress = min_progress + (max_progress - min_progress) * completed_chunks / total_chunks
+            progress = max(progress, min(chunk_progress, max_progress))
+        
         progress_bar.progress(progress)
         
         # Update status with elapsed time
@@ -236,6 +338,7 @@ def transcribe_with_progress(audio_path: Path, video_id: str, url: str, metadata
         - ⏱️ Audio duration: **{int(audio_duration)}s**  
         - ⏱️ Elapsed time: **{int(elapsed)}s** / ~{int(total_time_estimate)}s
         - 📊 Progress: **{int(progress * 100)}%**
+        - 🧩 Chunks done: **{completed_chunks}/{total_chunks}**
         
         *This may take a few minutes for large files. Please wait...*
         """)
@@ -244,6 +347,7 @@ def transcribe_with_progress(audio_path: Path, video_id: str, url: str, metadata
     
     # Wait for thread to complete
     transcription_thread.join()
+    preview_container.empty()
     
     # Check for errors
     if error_occurred:
@@ -266,74 +370,450 @@ def transcribe_with_progress(audio_path: Path, video_id: str, url: str, metadata
     return result
 
 
-def fix_number_formatting(text: str) -> str:
+@st.cache_resource(max_entries=32, show_spinner=False)
+def load_transcript_from_path(
+    path: str,
+    mtime: float,
+    video_id: str,
+    url: str,
+    title: Optional[str] = None
+) -> Transcript:
     """
-    Wrap numbers in spans to prevent them from breaking across lines.
-    This fixes the issue where numbers like '100 million' break into '1 0 0 m i l l i o n'.
+    Load a Transcript from a transcript.json file.
+    mtime is only used as part of the cache key so a rewritten file is re-read.
+    video_id, url and title are fallbacks for fields missing from the file.
     
-    Uses a simple approach that avoids complex lookbehinds which can cause regex errors.
+    A cached resource, so every caller gets the same Transcript object instead
+    of unpickling a copy of every Segment - callers must treat it as read-only.
     """
-    # Strategy: Process text in chunks, avoiding HTML tags
-    # Split by HTML tags to process text content separately from tags
+    data = orjson.loads(Path(path).read_bytes())
     
-    # First, handle number ranges (most specific pattern)
-    text = re.sub(
-        r'(\d+)\s+to\s+(\d+)\s*(million|billion|trillion|thousand|hundred|per\s+\w+)?',
-        r'<span style="white-space: nowrap;">\1 to \2\3</span>',
-        text,
-        flags=re.IGNORECASE
-    )
+    # One itemgetter call per segment instead of three dict lookups
+    segments = [Segment(*SEGMENT_FIELDS(s)) for s in data.get('segments', [])]
     
-    # Then handle number + scale word combinations
-    text = re.sub(
-        r'(\$|€|£)?\s*(\d+[\d,\s.]*)\s+(million|billion|trillion|thousand|hundred)',
-        r'<span style="white-space: nowrap;">\1\2 \3</span>',
-        text,
-        flags=re.IGNORECASE
+    transcript = Transcript(
+        video_id=data.get('video_id', video_id),
+        url=data.get('url', url),
+        title=data.get('title', title),
+        channel=data.get('channel'),
+        duration=data.get('duration'),
+        language=data.get('language'),
+        segments=segments
     )
+    # Build the display labels now, so they're part of the cached value
+    transcript.timestamp_labels()
+    return transcript
+
+
+def _hash_transcript(transcript: Transcript) -> str:
+    """Content hash of a transcript, used as its st.cache_data key."""
+    return hashlib.sha1(f"{transcript.video_id}\n{transcript.full_text}".encode('utf-8')).hexdigest()
+
+
+@st.cache_data(hash_funcs={Transcript: _hash_transcript}, show_spinner=False, max_entries=16)
+def build_cached_chat_prefix(transcript: Transcript) -> list:
+    """
+    Chat prefix messages (system prompt + transcript), cached on the transcript's content.
+    Built once per transcript (shared across sessions) and reused unchanged, so every
+    turn sends an identical prefix that OpenAI's prompt cache can match.
+    """
+    return _lazy("yt2txt.chat").build_chat_prefix(transcript.full_text)
+
+
+def get_chat_prefix(transcript: Transcript) -> list:
+    """
+    Chat prefix for the loaded transcript.
+    Kept in session state by identity, so chat turns don't re-hash the transcript
+    text or unpickle a fresh copy of the prefix from build_cached_chat_prefix.
+    """
+    if st.session_state.get('chat_prefix_source') is not transcript:
+        st.session_state.chat_prefix = build_cached_chat_prefix(transcript)
+        st.session_state.chat_prefix_source = transcript
+    return st.session_state.chat_prefix
+
+
+def iter_chat_answer(client, transcript: Transcript, history: list, user_content: str):
+    """
+    Stream the assistant's answer to user_content as text deltas.
     
-    # For standalone numbers, use a simpler approach:
-    # Process the text by splitting on HTML tags, then processing text parts only
-    parts = []
-    last_end = 0
+    With the Responses API the conversation is kept server-side: follow-up turns
+    send only the new question with previous_response_id instead of re-sending
+    the transcript, as long as that response is known to end at the last turn in
+    history (see remember_chat_response). Otherwise - first turn, or a stream that
+    was interrupted before it completed - the full conversation is sent. SDKs
+    without the Responses API fall back to chat completions with the full message list.
     
-    # Find all HTML tags (including our newly added spans)
-    for match in re.finditer(r'<[^>]+>', text):
-        # Process text before the tag
-        before_text = text[last_end:match.start()]
-        if before_text:
-            # Wrap standalone numbers in the text (not in tags)
-            before_text = re.sub(
-                r'\b(\d{2,}[\d,.]*)\b',
-                r'<span style="white-space: nowrap;">\1</span>',
-                before_text
-            )
-            parts.append(before_text)
+    Args:
+        client: OpenAI client
+        transcript: Transcript being discussed
+        history: Answered (role, content) turns before this question
+        user_content: The new user message
+    """
+    analysis_model = Config.ANALYSIS_MODEL
+    request_params = {"model": analysis_model, "stream": True}
+    if not analysis_model.startswith("gpt-5"):
+        request_params["temperature"] = 0.3
+    
+    # Cached, unchanging prefix (system + transcript), then the conversation
+    messages = get_chat_prefix(transcript) + [
+        {"role": role, "content": content} for role, content in history
+    ] + [{"role": "user", "content": user_content}]
+    
+    if hasattr(client, "responses"):
+        previous = st.session_state.get('chat_response')
+        if history and previous and previous[:2] == (transcript.video_id, len(history)):
+            request_params["input"] = user_content
+            request_params["previous_response_id"] = previous[2]
+        else:
+            request_params["input"] = messages
         
-        # Add the tag itself unchanged
-        parts.append(match.group(0))
-        last_end = match.end()
+        st.session_state.pop('chat_completed_response', None)
+        for event in client.responses.create(**request_params):
+            if event.type == "response.output_text.delta":
+                yield event.delta
+            elif event.type == "response.completed":
+                # Adopted by remember_chat_response once the turn is recorded
+                st.session_state.chat_completed_response = event.response.id
+            elif event.type == "response.failed":
+                raise RuntimeError(event.response.error.message if event.response.error else "Response failed")
+            elif event.type == "error":
+                raise RuntimeError(event.message)
+        return
     
-    # Process remaining text after last tag
-    remaining_text = text[last_end:]
-    if remaining_text:
-        remaining_text = re.sub(
-            r'\b(\d{2,}[\d,.]*)\b',
-            r'<span style="white-space: nowrap;">\1</span>',
-            remaining_text
+    request_params["messages"] = messages
+    for chunk in client.chat.completions.create(**request_params):
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def remember_chat_response(transcript: Transcript) -> None:
+    """
+    Tie the response completed by the last iter_chat_answer call to the chat
+    history as just recorded, so the next turn continues from it only while the
+    history still ends at that turn.
+    """
+    response_id = st.session_state.pop('chat_completed_response', None)
+    if response_id is not None:
+        st.session_state.chat_response = (
+            transcript.video_id, len(st.session_state.chat_messages), response_id
         )
-        parts.append(remaining_text)
-    
-    # If no HTML tags found, process entire text
-    if not parts:
-        text = re.sub(
-            r'\b(\d{2,}[\d,.]*)\b',
-            r'<span style="white-space: nowrap;">\1</span>',
-            text
+
+
+def run_chat_turn(transcript: Transcript, user_question: str) -> None:
+    """
+    Answer one question from the Chat tab: show it, stream the reply into an
+    assistant message, and record both in st.session_state.chat_messages.
+    """
+    # Add user message to history and show it right away
+    st.session_state.chat_messages.append(("user", user_question))
+    with st.chat_message("user"):
+        st.markdown(fix_number_formatting(user_question), unsafe_allow_html=True)
+    
+    # Questions sent while an earlier answer was streaming interrupted that run
+    # and are still unanswered - answer all of them with one request
+    answered_count = len(st.session_state.chat_messages)
+    while answered_count and st.session_state.chat_messages[answered_count - 1][0] == "user":
+        answered_count -= 1
+    pending_questions = [content for _, content in st.session_state.chat_messages[answered_count:]]
+    
+    # Stream the AI response into the assistant message as it arrives
+    with st.chat_message("assistant"):
+        response_placeholder = st.empty()
+        try:
+            # Shared OpenAI client (keeps its connection pool across turns)
+            client = get_chat_client(Config.OPENAI_API_KEY)
+            chat = _lazy("yt2txt.chat")
+            
+            if len(pending_questions) > 1:
+                user_content = chat.build_batched_question(pending_questions)
+            else:
+                user_content = user_question
+            
+            response_placeholder.markdown("_Thinking..._")
+            stream = iter_chat_answer(
+                client, transcript, st.session_state.chat_messages[:answered_count], user_content
+            )
+            
+            response_parts = []
+            last_render = 0.0
+            for delta in stream:
+                response_parts.append(delta)
+                # Throttle re-renders - each one re-formats the whole partial answer
+                now = time.time()
+                if now - last_render >= STREAM_RENDER_INTERVAL:
+                    response_placeholder.markdown(_wrap_numbers("".join(response_parts)), unsafe_allow_html=True)
+                    last_render = now
+            
+            ai_response = "".join(response_parts)
+            response_placeholder.markdown(fix_number_formatting(ai_response), unsafe_allow_html=True)
+            
+            batched_answers = None
+            if len(pending_questions) > 1:
+                batched_answers = chat.split_batched_answer(ai_response, len(pending_questions))
+            
+            if batched_answers:
+                # Pair each answer with its question, then redraw the history
+                del st.session_state.chat_messages[answered_count:]
+                for question, answer in zip(pending_questions, batched_answers):
+                    st.session_state.chat_messages.append(("user", question))
+                    st.session_state.chat_messages.append(("assistant", answer))
+                remember_chat_response(transcript)
+                st.rerun()
+            
+            # Add AI response to history (already on screen, so no rerun needed)
+            st.session_state.chat_messages.append(("assistant", ai_response))
+            remember_chat_response(transcript)
+            
+        except Exception as e:
+            response_placeholder.empty()
+            st.error(f"Error getting response: {str(e)}")
+            # Remove the unanswered user messages if there was an error
+            del st.session_state.chat_messages[answered_count:]
+
+
+def get_full_transcript_text(transcript: Transcript) -> str:
+    """
+    "[MM:SS] text" rendering of the whole transcript for the Transcript tab.
+    Stored in session state so reruns reuse it until a different transcript is loaded.
+    """
+    key = (transcript.video_id, len(transcript.segments))
+    if st.session_state.get('full_transcript_key') != key:
+        # Write into one buffer instead of building a str per segment and joining
+        buf = io.StringIO()
+        separator = ""
+        for label, seg in zip(transcript.timestamp_labels(), transcript.segments):
+            buf.write(f"{separator}{label} ")
+            buf.write(seg.text)
+            separator = "\n\n"
+        st.session_state.full_transcript_text = buf.getvalue()
+        st.session_state.full_transcript_key = key
+    return st.session_state.full_transcript_text
+
+
+def start_background_task(key: str, video_id: str, fn, *args) -> None:
+    """Run fn(*args) on the background pool and remember it in session state under key."""
+    task = st.session_state.get(key)
+    if task is not None and task[0] == video_id and not task[1].done():
+        # Already running for this video - don't pay for a second call
+        return
+    st.session_state[key] = (video_id, get_background_pool().submit(fn, *args))
+
+
+def poll_background_task(key: str, video_id: str, message: str, preview: Optional[dict] = None):
+    """
+    Result of the task stored under key once it has finished (re-raising its error).
+    
+    Returns None if there is no task, it belongs to a different video, or it is
+    still running. While it runs, message (and preview's 'text', filled in by the
+    task as it streams) is shown and a poll rerun is requested for the end of this
+    run, so the script thread never blocks on the task.
+    """
+    task = st.session_state.get(key)
+    if task is None:
+        return None
+    task_video_id, future = task
+    if task_video_id != video_id:
+        # Started for a transcript that is no longer loaded
+        del st.session_state[key]
+        return None
+    
+    if not future.done():
+        st.info(f"⏳ {message}")
+        if preview is not None and preview.get('text'):
+            st.markdown(preview['text'].translate(_DOLLAR_ESCAPE_TABLE))
+        st.session_state.background_poll_pending = True
+        return None
+    del st.session_state[key]
+    return future.result()
+
+
+def rerun_if_polling() -> None:
+    """Rerun after a short sleep if a background task asked to be polled during this run."""
+    if st.session_state.pop('background_poll_pending', False):
+        time.sleep(BACKGROUND_POLL_INTERVAL)
+        st.rerun()
+
+
+def file_mtime(path: Path) -> Optional[float]:
+    """Modification time of a file, or None if it doesn't exist."""
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def read_file_bytes(path: str, mtime: float) -> bytes:
+    """
+    Contents of a file for a download button, cached across reruns.
+    mtime is only used as part of the cache key so a rewritten file is re-read.
+    cache_resource hands every rerun the same (immutable) bytes object, where
+    cache_data would unpickle a fresh copy of the file each time. Not persisted:
+    the file itself is already on disk, next to where a persisted copy would go.
+    """
+    return Path(path).read_bytes()
+
+
+def get_safe_formatted_text(formatted_text: str) -> str:
+    """
+    Formatted transcript with "$" escaped for st.markdown.
+    Stored in session state so reruns reuse it until the formatted text is replaced
+    (an identity check, so unchanged text costs nothing to verify).
+    """
+    if st.session_state.get('safe_formatted_source') is not formatted_text:
+        st.session_state.safe_formatted = formatted_text.translate(_DOLLAR_ESCAPE_TABLE)
+        st.session_state.safe_formatted_source = formatted_text
+    return st.session_state.safe_formatted
+
+
+def read_text_if_exists(path: Path) -> Optional[str]:
+    """Return the contents of a text file, or None if it doesn't exist."""
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def load_prior_transcript(transcript_path: Path, video_id: str, url: str, title: Optional[str]):
+    """
+    Load a prior transcript with its cached analysis and formatted text.
+    The three files are read on worker threads so they load concurrently.
+    
+    Returns:
+        Tuple of (transcript, analysis_text, formatted_text)
+    """
+    output_dir = transcript_path.parent
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        transcript_future = executor.submit(
+            load_transcript_from_path,
+            str(transcript_path), transcript_path.stat().st_mtime, video_id, url, title
         )
+        analysis_future = executor.submit(read_text_if_exists, output_dir / "equity_analysis.txt")
+        formatted_future = executor.submit(read_text_if_exists, output_dir / "formatted_transcript.txt")
+        return transcript_future.result(), analysis_future.result(), formatted_future.result()
+
+
+def _wrap_number_token(match: re.Match) -> str:
+    """Wrap a single _RE_NUMBER_TOKEN match in a no-wrap span."""
+    if match.group('range'):
+        text = f"{match.group('low')} to {match.group('high')}"
+        if match.group('range_unit'):
+            text += f" {match.group('range_unit')}"
+    elif match.group('scale'):
+        text = f"{match.group('currency') or ''}{match.group('amount').strip()} {match.group('scale_unit')}"
+    else:
+        text = match.group('number')
+    return f'<span style="white-space: nowrap;">{text}</span>'
+
+
+def _iter_number_formatted_parts(text: str):
+    """Yield HTML tags unchanged and text between tags with numbers wrapped."""
+    last_end = 0
+    for match in _RE_TAG.finditer(text):
+        yield _RE_NUMBER_TOKEN.sub(_wrap_number_token, text[last_end:match.start()])
+        yield match.group(0)
+        last_end = match.end()
+    yield _RE_NUMBER_TOKEN.sub(_wrap_number_token, text[last_end:])
+
+
+def _wrap_numbers(text: str) -> str:
+    """Uncached body of fix_number_formatting (used directly for streaming partials)."""
+    # Nothing to wrap - skip tokenizing prose-only messages
+    if not _RE_DIGIT.search(text):
         return text
+    return ''.join(_iter_number_formatted_parts(text))
+
+
+@functools.lru_cache(maxsize=4096)
+def fix_number_formatting(text: str) -> str:
+    """
+    Wrap numbers in spans to prevent them from breaking across lines.
+    This fixes the issue where numbers like '100 million' break into '1 0 0 m i l l i o n'.
     
-    return ''.join(parts)
+    Single pass over the text: HTML tags are passed through untouched, and each
+    text run between tags is matched once against the combined number pattern.
+    Memoized per message text with lru_cache: str hashes are cached by CPython,
+    so re-rendering chat history is a dict lookup per message (st.cache_data
+    would re-hash and copy the text on every call).
+    """
+    return _wrap_numbers(text)
+
+
+# Sidecar index in OUT_DIR mapping video_id -> transcript.json path
+TRANSCRIPT_INDEX_NAME = ".index.json"
+
+
+@st.cache_resource
+def load_transcript_index(out_dir: str) -> dict:
+    """
+    Load the video_id -> transcript path index for an output directory.
+    Cached as a resource so reruns share one dict instead of re-reading the file.
+    """
+    index_path = Path(out_dir) / TRANSCRIPT_INDEX_NAME
+    try:
+        return orjson.loads(index_path.read_bytes())
+    except (orjson.JSONDecodeError, IOError):
+        return {}
+
+
+@st.cache_resource
+def get_transcript_index_lock() -> threading.Lock:
+    """
+    Lock around reads and writes of the shared index dicts and their files.
+    A cached resource rather than a module global: this script is re-executed on
+    every rerun, so a global would be a new lock each run and guard nothing.
+    """
+    return threading.Lock()
+
+
+def record_transcript_index(out_dir: Path, video_id: str, transcript_path: Path) -> None:
+    """Add a transcript to the index and persist it (atomic replace)."""
+    index = load_transcript_index(str(out_dir))
+    index_path = out_dir / TRANSCRIPT_INDEX_NAME
+    tmp_path = index_path.with_suffix('.tmp')
+    
+    # Every session shares the index dict, so it is only touched with the lock held
+    with get_transcript_index_lock():
+        if index.get(video_id) == str(transcript_path):
+            return
+        index[video_id] = str(transcript_path)
+        try:
+            tmp_path.write_bytes(orjson.dumps(index, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_path, index_path)
+        except OSError:
+            # Index is only an optimization - lookups fall back to a full scan
+            pass
+
+
+def iter_transcript_candidates(out_dir: Path, video_id: str):
+    """
+    Yield transcript.json paths that may belong to video_id, cheapest first:
+    the index entry, then top-level folders named with the video_id
+    (as download_audio does), then a full recursive scan as a last resort.
+    """
+    index = load_transcript_index(str(out_dir))
+    with get_transcript_index_lock():
+        indexed_path = index.get(video_id)
+    if indexed_path and Path(indexed_path).exists():
+        yield Path(indexed_path)
+    
+    with os.scandir(out_dir) as entries:
+        for entry in entries:
+            if video_id in entry.name and entry.is_dir():
+                candidate = Path(entry.path) / "transcript.json"
+                if candidate.exists():
+                    yield candidate
+    
+    yield from out_dir.rglob("transcript.json")
+
+
+def list_file_names(directory: Path) -> set:
+    """Names of the entries in a directory - one scandir call instead of a stat per file."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
 
 
 def process_video_streamlit(url: str, analyze: bool):
@@ -353,71 +833,62 @@ def process_video_streamlit(url: str, analyze: bool):
         try:
             # FIRST: Check for cached transcript BEFORE downloading audio
             # Extract video_id to search for existing transcripts
-            from yt2txt.downloader import extract_video_id
-            video_id = extract_video_id(url)
+            downloader = _lazy("yt2txt.downloader")
+            video_id = downloader.extract_video_id(url)
             
             transcript_cached = False
             transcript_path = None
             output_dir = None
             metadata = {}
             
-            # Search for existing transcript by video_id
-            if persistent_out_dir.exists():
-                for transcript_file in persistent_out_dir.rglob("transcript.json"):
-                    try:
-                        with open(transcript_file, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            if data.get('video_id') == video_id:
-                                # Found cached transcript!
-                                transcript_path = transcript_file
-                                output_dir = transcript_file.parent
-                                st.session_state.output_dir = output_dir
-                                metadata = {
-                                    'url': data.get('url', url),
-                                    'video_id': video_id,
-                                    'title': data.get('title'),
-                                    'channel': data.get('channel'),
-                                    'duration': data.get('duration'),
-                                    'upload_date': data.get('upload_date'),
-                                }
-                                transcript_cached = True
-                                st.info(f"✓ Found cached transcript for this video!")
-                                break
-                    except (json.JSONDecodeError, IOError):
-                        continue
+            # Remember what's already loaded so we don't re-read files we hold in memory
+            previous_output_dir = st.session_state.output_dir
+            
+            # Search for existing transcript by video_id (persistent_out_dir was created above).
+            # Candidates go through the cached loader, so the match is parsed only once
+            # and is the transcript used below
+            transcript = None
+            for transcript_file in iter_transcript_candidates(persistent_out_dir, video_id):
+                try:
+                    candidate = load_transcript_from_path(
+                        str(transcript_file), transcript_file.stat().st_mtime, video_id, url
+                    )
+                except (orjson.JSONDecodeError, IOError):
+                    continue
+                if candidate.video_id == video_id:
+                    # Found cached transcript!
+                    transcript = candidate
+                    transcript_path = transcript_file
+                    output_dir = transcript_file.parent
+                    st.session_state.output_dir = output_dir
+                    transcript_cached = True
+                    st.info(f"✓ Found cached transcript for this video!")
+                    break
             
             # Only download audio if we don't have a cached transcript
             if not transcript_cached:
                 # Download audio
                 with st.spinner("Downloading audio from YouTube..."):
-                    audio_path, metadata, video_id = download_audio(url, force=False)
+                    audio_path, metadata, video_id = downloader.download_audio(url, force=False)
                     output_dir = audio_path.parent
                     st.session_state.output_dir = output_dir
-                
+            
+            # One directory listing answers all of the existence checks below
+            existing_files = list_file_names(output_dir)
+            same_video_loaded = previous_output_dir == output_dir
+            
+            if transcript_path is None:
                 # Check if transcript exists in the newly downloaded directory
                 transcript_path = output_dir / "transcript.json"
-                transcript_cached = transcript_path.exists()
+                transcript_cached = "transcript.json" in existing_files
             
             if transcript_cached:
                 # Load cached transcript (NO API CALL - saves money!)
                 try:
-                    with open(transcript_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    segments = [
-                        Segment(start=s['start'], end=s['end'], text=s['text'])
-                        for s in data.get('segments', [])
-                    ]
-                    
-                    transcript = Transcript(
-                        video_id=data.get('video_id', video_id),
-                        url=data.get('url', url),
-                        title=data.get('title'),
-                        channel=data.get('channel'),
-                        duration=data.get('duration'),
-                        language=data.get('language'),
-                        segments=segments
-                    )
+                    if transcript is None:
+                        transcript = load_transcript_from_path(
+                            str(transcript_path), transcript_path.stat().st_mtime, video_id, url
+                        )
                     st.session_state.transcript = transcript
                     st.success("✓ Cached transcript loaded (no cost)")
                 except Exception as e:
@@ -439,38 +910,49 @@ def process_video_streamlit(url: str, analyze: bool):
                     st.error("Error: No audio path available for transcription")
                     return False, None
             
-            # Write transcript files
-            with st.spinner("Saving transcript files..."):
-                write_json(transcript, output_dir / "transcript.json")
-                write_txt(transcript, output_dir / "transcript_with_timestamps.txt")
-                write_srt(transcript, output_dir / "transcript.srt")
-            
-            # Analyze transcript if requested
-            if analyze:
-                analysis_path = output_dir / "equity_analysis.txt"
-                if analysis_path.exists():
-                    st.info("ℹ️ Using cached analysis - loading from previous run")
-                    with open(analysis_path, 'r', encoding='utf-8') as f:
-                        analysis_text = f.read()
-                    st.session_state.analysis_text = analysis_text
-                    st.success("✓ Analysis loaded from cache!")
-                else:
+            # Write transcript files and run analysis concurrently
+            # The writers only need the transcript, so they overlap with the GPT call
+            # (Streamlit calls stay on this thread - workers only do I/O)
+            analysis_path = output_dir / "equity_analysis.txt"
+            analysis_loaded = analyze and same_video_loaded and bool(st.session_state.analysis_text)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                # A transcript loaded from cache only needs the files that are missing
+                skip_existing = frozenset(existing_files) if transcript_cached else frozenset()
+                write_future = executor.submit(write_transcript_files, transcript, output_dir, skip_existing)
+                analysis_future = None
+                if analyze and not analysis_loaded:
+                    # Same caches as the CLI: equity_analysis.txt, then the content cache
+                    # keyed on transcript, model and prompt
+                    analysis_future = executor.submit(
+                        _lazy("yt2txt.analyzer").analyze_transcript, transcript, output_dir
+                    )
+                
+                with st.spinner("Saving transcript files..."):
+                    write_future.result()
+                record_transcript_index(persistent_out_dir, transcript.video_id, output_dir / "transcript.json")
+                
+                # Analyze transcript if requested (a repeat analysis is a cache hit)
+                if analysis_loaded:
+                    st.info("ℹ️ Using the analysis already loaded for this video")
+                elif analysis_future is not None:
                     with st.spinner("Analyzing transcript with GPT (this may take a minute)..."):
                         try:
-                            analysis_text = analyze_transcript(transcript, output_dir, force=False)
-                            write_analysis(analysis_text, output_dir / "equity_analysis.txt")
+                            analysis_text = analysis_future.result()
+                            # An existing equity_analysis.txt is where the text came from
+                            if "equity_analysis.txt" not in existing_files:
+                                write_analysis(analysis_text, analysis_path)
                             st.session_state.analysis_text = analysis_text
                             st.success("✓ Analysis complete!")
                         except Exception as e:
                             st.error(f"⚠ Error analyzing transcript: {str(e)}")
             
-            # Check for cached formatted transcript
+            # Check for cached formatted transcript (unless it's already in memory)
             formatted_path = output_dir / "formatted_transcript.txt"
-            if formatted_path.exists():
+            if "formatted_transcript.txt" not in existing_files:
+                st.session_state.formatted_transcript = None
+            elif not (same_video_loaded and st.session_state.formatted_transcript):
                 with open(formatted_path, 'r', encoding='utf-8') as f:
                     st.session_state.formatted_transcript = f.read()
-            else:
-                st.session_state.formatted_transcript = None
             
             return True, output_dir
             
@@ -486,6 +968,10 @@ def process_video_streamlit(url: str, analyze: bool):
 def main():
     """Main Streamlit application."""
     
+    # Read the loaded transcript's fields once per rerun instead of in every tab
+    current_transcript = st.session_state.transcript
+    current_title = current_transcript.title if current_transcript else None
+    
     # Header
     st.markdown('<div class="main-header">🎥 YouTube Video Transcriber</div>', unsafe_allow_html=True)
     
@@ -496,10 +982,10 @@ def main():
         
         # Show current status
         st.subheader("📊 Current Status")
-        if st.session_state.transcript:
-            if hasattr(st.session_state.transcript, 'title') and st.session_state.transcript.title:
-                st.caption(f"**Video:** {st.session_state.transcript.title}")
-            st.success(f"✓ Transcript ready ({len(st.session_state.transcript.segments)} segments)")
+        if current_transcript:
+            if current_title:
+                st.caption(f"**Video:** {current_title}")
+            st.success(f"✓ Transcript ready ({len(current_transcript.segments)} segments)")
             if st.session_state.analysis_text:
                 st.success("✓ Analysis ready")
             else:
@@ -516,58 +1002,39 @@ def main():
         st.divider()
         st.subheader("📚 Prior Transcripts")
         if st.session_state.transcript_history:
-            for i, (video_id, title, url, transcript_path) in enumerate(st.session_state.transcript_history[:10]):  # Show last 10
-                # Check if this is the current transcript
-                is_current = (st.session_state.transcript and 
-                            hasattr(st.session_state.transcript, 'video_id') and 
-                            st.session_state.transcript.video_id == video_id)
-                
-                if is_current:
+            history = st.session_state.transcript_history[:10]  # Show last 10
+            
+            # Button labels only change when the history does - rebuild them on change only
+            history_key = tuple(h[0] for h in history)
+            if st.session_state.get('history_labels_key') != history_key:
+                st.session_state.history_labels = [
+                    f"📹 {title[:50]}..." if len(title) > 50 else f"📹 {title}"
+                    for title in (h[1] or h[0] for h in history)
+                ]
+                st.session_state.history_labels_key = history_key
+            
+            current_video_id = current_transcript.video_id if current_transcript else None
+            
+            for i, (video_id, title, url, transcript_path) in enumerate(history):
+                if video_id == current_video_id:
                     st.markdown(f"**{title}** (Current)")
                 else:
                     # Button to load this transcript
-                    if st.button(f"📹 {title[:50]}..." if len(title) > 50 else f"📹 {title}", 
+                    if st.button(st.session_state.history_labels[i],
                                key=f"load_transcript_{i}", use_container_width=True):
                         # Load transcript from file
                         try:
                             transcript_path_obj = Path(transcript_path)
                             if transcript_path_obj.exists():
-                                with open(transcript_path_obj, 'r', encoding='utf-8') as f:
-                                    data = json.load(f)
-                                
-                                segments = [
-                                    Segment(start=s['start'], end=s['end'], text=s['text'])
-                                    for s in data.get('segments', [])
-                                ]
-                                
-                                transcript = Transcript(
-                                    video_id=data.get('video_id', video_id),
-                                    url=data.get('url', url),
-                                    title=data.get('title', title),
-                                    channel=data.get('channel'),
-                                    duration=data.get('duration'),
-                                    language=data.get('language'),
-                                    segments=segments
-                                )
+                                with st.spinner("Loading transcript..."):
+                                    transcript, analysis_text, formatted_text = load_prior_transcript(
+                                        transcript_path_obj, video_id, url, title
+                                    )
                                 
                                 st.session_state.transcript = transcript
                                 st.session_state.current_video_url = url
-                                
-                                # Try to load analysis if it exists
-                                analysis_path = transcript_path_obj.parent / "equity_analysis.txt"
-                                if analysis_path.exists():
-                                    with open(analysis_path, 'r', encoding='utf-8') as f:
-                                        st.session_state.analysis_text = f.read()
-                                else:
-                                    st.session_state.analysis_text = None
-                                
-                                # Try to load formatted transcript if it exists
-                                formatted_path = transcript_path_obj.parent / "formatted_transcript.txt"
-                                if formatted_path.exists():
-                                    with open(formatted_path, 'r', encoding='utf-8') as f:
-                                        st.session_state.formatted_transcript = f.read()
-                                else:
-                                    st.session_state.formatted_transcript = None
+                                st.session_state.analysis_text = analysis_text
+                                st.session_state.formatted_transcript = formatted_text
                                 
                                 # Set output dir
                                 st.session_state.output_dir = transcript_path_obj.parent
@@ -624,48 +1091,51 @@ def main():
                             title = getattr(st.session_state.transcript, 'title', 'Unknown')
                             url_for_history = st.session_state.transcript.url or url
                             
-                            # Check if already in history
-                            if not any(h[0] == video_id for h in st.session_state.transcript_history):
-                                st.session_state.transcript_history.insert(0, (video_id, title, url_for_history, str(output_dir / "transcript.json")))
-                            
-                            # Check if already in history
-                            if not any(h[0] == video_id for h in st.session_state.transcript_history):
+                            # Check if already in history (set lookup instead of scanning the list)
+                            if video_id not in st.session_state.transcript_history_ids:
                                 st.session_state.transcript_history.insert(0, (video_id, title, url_for_history, str(output_dir / "transcript.json")))
+                                st.session_state.transcript_history_ids.add(video_id)
                 except Exception as e:
                     st.session_state.processing = False
                     st.error(f"❌ Error: {str(e)}")
                     st.exception(e)  # Show full error traceback for debugging
+                
+                # Processing may have loaded a different transcript
+                current_transcript = st.session_state.transcript
+                current_title = current_transcript.title if current_transcript else None
         
         # Show current transcript if available (even when navigating back)
-        if st.session_state.transcript:
+        if current_transcript:
             st.divider()
             st.subheader("📝 Current Transcript")
-            if hasattr(st.session_state.transcript, 'title') and st.session_state.transcript.title:
-                st.caption(f"**Video:** {st.session_state.transcript.title}")
-            if hasattr(st.session_state.transcript, 'channel') and st.session_state.transcript.channel:
-                st.caption(f"**Channel:** {st.session_state.transcript.channel}")
+            if current_title:
+                st.caption(f"**Video:** {current_title}")
+            if current_transcript.channel:
+                st.caption(f"**Channel:** {current_transcript.channel}")
             
             # Show download options
-            if st.session_state.output_dir and (st.session_state.output_dir / "transcript_with_timestamps.txt").exists():
+            txt_path = st.session_state.output_dir / "transcript_with_timestamps.txt" if st.session_state.output_dir else None
+            txt_mtime = file_mtime(txt_path) if txt_path else None
+            if txt_mtime is not None:
                 st.subheader("📥 Download Files")
                 # Use very tight columns to bring buttons even closer
                 col1, col2, col3 = st.columns([1, 1, 6])
                 
                 with col1:
-                    with open(st.session_state.output_dir / "transcript_with_timestamps.txt", "r", encoding="utf-8") as f:
-                        st.download_button(
-                            "📄 Download TXT",
-                            f.read(),
-                            file_name="transcript.txt",
-                            mime="text/plain",
-                            key="download_txt_current"
-                        )
+                    st.download_button(
+                        "📄 Download TXT",
+                        read_file_bytes(str(txt_path), txt_mtime),
+                        file_name="transcript.txt",
+                        mime="text/plain",
+                        key="download_txt_current"
+                    )
                 
                 if st.session_state.analysis_text:
                     with col2:
                         st.download_button(
                             "📊 Download Analysis",
-                            st.session_state.analysis_text,
+                            # Already in memory - no need to go back to disk
+                            st.session_state.analysis_text.encode('utf-8'),
                             file_name="equity_analysis.txt",
                             mime="text/plain",
                             key="download_analysis_current"
@@ -677,17 +1147,17 @@ def main():
     with tab2:
         st.header("📝 Full Transcript")
         
-        if st.session_state.transcript is None:
+        if current_transcript is None:
             st.info("👆 First transcribe a video in the 'Transcribe' tab to view the full transcript.")
         else:
             # Show video info
-            if hasattr(st.session_state.transcript, 'title') and st.session_state.transcript.title:
-                st.subheader(st.session_state.transcript.title)
-            if hasattr(st.session_state.transcript, 'channel') and st.session_state.transcript.channel:
-                st.caption(f"Channel: {st.session_state.transcript.channel}")
-            if hasattr(st.session_state.transcript, 'duration') and st.session_state.transcript.duration:
-                minutes = int(st.session_state.transcript.duration // 60)
-                seconds = int(st.session_state.transcript.duration % 60)
+            if current_title:
+                st.subheader(current_title)
+            if current_transcript.channel:
+                st.caption(f"Channel: {current_transcript.channel}")
+            if current_transcript.duration:
+                minutes = int(current_transcript.duration // 60)
+                seconds = int(current_transcript.duration % 60)
                 st.caption(f"Duration: {minutes}:{seconds:02d}")
             
             st.divider()
@@ -696,14 +1166,22 @@ def main():
             col1, col2 = st.columns([1, 3])
             with col1:
                 if st.button("✨ Format Transcript (Paragraphs)", use_container_width=True, help="Reformat transcript into paragraphs with speaker labels (uses GPT)"):
-                    with st.spinner("Formatting transcript..."):
-                        try:
-                            formatted_text = format_transcript(st.session_state.transcript, st.session_state.output_dir)
-                            st.session_state.formatted_transcript = formatted_text
-                            st.success("✓ Transcript formatted!")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Error formatting transcript: {e}")
+                    # Runs off the script thread - a rerun while it works doesn't lose the result
+                    start_background_task(
+                        'format_task', st.session_state.transcript.video_id,
+                        _lazy("yt2txt.formatter").format_transcript,
+                        st.session_state.transcript, st.session_state.output_dir
+                    )
+                try:
+                    formatted_text = poll_background_task(
+                        'format_task', st.session_state.transcript.video_id, "Formatting transcript..."
+                    )
+                    if formatted_text is not None:
+                        st.session_state.formatted_transcript = formatted_text
+                        st.success("✓ Transcript formatted!")
+                        st.rerun()
+                except Exception as e:
+                    st.error(f"Error formatting transcript: {e}")
             
             st.divider()
             
@@ -711,14 +1189,11 @@ def main():
             if st.session_state.formatted_transcript:
                 st.info("✓ Viewing formatted transcript")
                 # Escape dollar signs to prevent Streamlit from interpreting them as LaTeX
-                safe_text = st.session_state.formatted_transcript.replace("$", "\\$")
+                safe_text = get_safe_formatted_text(st.session_state.formatted_transcript)
                 st.markdown(f'<div class="transcript-text">{safe_text}</div>', unsafe_allow_html=True)
             else:
-                # Display full transcript with better formatting
-                transcript_text = "\n\n".join(
-                    f"[{int(seg.start // 60):02d}:{int(seg.start % 60):02d}] {seg.text}"
-                    for seg in st.session_state.transcript.segments
-                )
+                # Display full transcript with better formatting (built once per transcript)
+                transcript_text = get_full_transcript_text(st.session_state.transcript)
                 
                 st.markdown(f'<div class="transcript-text">{transcript_text}</div>', unsafe_allow_html=True)
     
@@ -727,12 +1202,12 @@ def main():
         st.header("💬 Ask AI About Your Video")
         
         # Check for transcript in session state
-        if st.session_state.transcript is None:
+        if current_transcript is None:
             st.info("👆 First transcribe a video in the 'Transcribe' tab to start asking questions.")
         else:
             # Show video info if available
-            if hasattr(st.session_state.transcript, 'title') and st.session_state.transcript.title:
-                st.caption(f"📹 {st.session_state.transcript.title}")
+            if current_title:
+                st.caption(f"📹 {current_title}")
             st.success("✓ Video loaded")
             
             # Display chat history
@@ -748,60 +1223,7 @@ def main():
             user_question = st.chat_input("Ask your video for a recap, or any other question!")
             
             if user_question:
-                # Add user message to history
-                st.session_state.chat_messages.append(("user", user_question))
-                
-                # Get AI response
-                with st.spinner("Thinking..."):
-                    try:
-                        # Initialize OpenAI client
-                        from openai import OpenAI
-                        client = OpenAI(api_key=Config.OPENAI_API_KEY, timeout=300.0)
-                        
-                        # Get transcript text
-                        from yt2txt.analyzer import get_transcript_text
-                        transcript_text = get_transcript_text(st.session_state.transcript)
-                        
-                        # Build messages
-                        messages = [
-                            {
-                                "role": "system",
-                                "content": "You are an expert equity analyst analyzing a CEO interview transcript. Answer questions based on the transcript content. If the transcript doesn't contain the information, say so. Never guess or make up information."
-                            },
-                            {
-                                "role": "user",
-                                "content": f"Here is the transcript from a CEO interview:\n\n{transcript_text}"
-                            }
-                        ]
-                        
-                        # Add conversation history
-                        for role, content in st.session_state.chat_messages:
-                            messages.append({"role": role, "content": content})
-                        
-                        # Get response
-                        analysis_model = Config.ANALYSIS_MODEL
-                        request_params = {
-                            "model": analysis_model,
-                            "messages": messages
-                        }
-                        
-                        if not analysis_model.startswith("gpt-5"):
-                            request_params["temperature"] = 0.3
-                        
-                        response = client.chat.completions.create(**request_params)
-                        ai_response = response.choices[0].message.content
-                        
-                        # Add AI response to history
-                        st.session_state.chat_messages.append(("assistant", ai_response))
-                        
-                        # Rerun to show new messages
-                        st.rerun()
-                        
-                    except Exception as e:
-                        st.error(f"Error getting response: {str(e)}")
-                        # Remove the user message if there was an error
-                        if st.session_state.chat_messages and st.session_state.chat_messages[-1][0] == "user":
-                            st.session_state.chat_messages.pop()
+                run_chat_turn(current_transcript, user_question)
             
             # Clear chat button
             if st.session_state.chat_messages:
@@ -814,12 +1236,12 @@ def main():
         st.header("📊 Equity Analysis")
         
         # Check if transcript is available
-        if st.session_state.transcript is None:
+        if current_transcript is None:
             st.info("👆 First transcribe a video in the 'Transcribe' tab to run equity analysis.")
         else:
             # Show video info if available
-            if hasattr(st.session_state.transcript, 'title') and st.session_state.transcript.title:
-                st.caption(f"📹 {st.session_state.transcript.title}")
+            if current_title:
+                st.caption(f"📹 {current_title}")
             
             # Check if analysis already exists
             if st.session_state.analysis_text:
@@ -831,33 +1253,42 @@ def main():
                 st.caption("This will use GPT to analyze the transcript from an equity research perspective.")
                 
                 if st.button("📊 Run Equity Analysis", type="primary", use_container_width=False):
-                    # Check if cached analysis exists
                     if st.session_state.output_dir:
-                        analysis_path = st.session_state.output_dir / "equity_analysis.txt"
-                        if analysis_path.exists():
-                            # Load cached analysis
-                            with st.spinner("Loading cached analysis..."):
-                                with open(analysis_path, 'r', encoding='utf-8') as f:
-                                    st.session_state.analysis_text = f.read()
-                                st.success("✓ Analysis loaded from cache!")
-                                st.rerun()
-                        else:
-                            # Run new analysis
-                            with st.spinner("Analyzing transcript with GPT (this may take a minute)..."):
-                                try:
-                                    from yt2txt.analyzer import analyze_transcript
-                                    from yt2txt.writers.analysis_writer import write_analysis
-                                    
-                                    analysis_text = analyze_transcript(st.session_state.transcript, st.session_state.output_dir, force=False)
-                                    write_analysis(analysis_text, analysis_path)
-                                    st.session_state.analysis_text = analysis_text
-                                    st.success("✓ Analysis complete!")
-                                    st.rerun()
-                                except Exception as e:
-                                    st.error(f"⚠ Error analyzing transcript: {str(e)}")
+                        # Run the analysis off the script thread (a repeat is a cache hit);
+                        # the worker streams partial text into the preview dict (never touching st itself)
+                        preview = {'text': ""}
+                        st.session_state.analysis_preview = preview
+                        start_background_task(
+                            'analysis_task', st.session_state.transcript.video_id,
+                            _lazy("yt2txt.analyzer").analyze_transcript,
+                            st.session_state.transcript,
+                            st.session_state.output_dir,
+                            False,
+                            functools.partial(preview.__setitem__, 'text')
+                        )
                     else:
                         st.error("Output directory not found. Please re-process the video.")
 
+                try:
+                    analysis_text = poll_background_task(
+                        'analysis_task', st.session_state.transcript.video_id,
+                        "Analyzing transcript with GPT (this may take a minute)...",
+                        preview=st.session_state.get('analysis_preview')
+                    )
+                    if analysis_text is not None:
+                        # An existing equity_analysis.txt is where the text came from
+                        analysis_path = st.session_state.output_dir / "equity_analysis.txt"
+                        if not analysis_path.exists():
+                            write_analysis(analysis_text, analysis_path)
+                        st.session_state.analysis_text = analysis_text
+                        st.success("✓ Analysis complete!")
+                        st.rerun()
+                except Exception as e:
+                    st.error(f"⚠ Error analyzing transcript: {str(e)}")
+    
+    # Check on running background tasks again once the whole page is drawn
+    rerun_if_polling()
+
 
 if __name__ == "__main__":
     main()
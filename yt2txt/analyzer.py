@@ -1,15 +1,37 @@
 """OpenAI GPT API integration for transcript analysis."""
 
+import asyncio
+import hashlib
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
+from contextlib import closing
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-from openai import OpenAI
-from openai import APIError, RateLimitError, APIConnectionError
-from tqdm import tqdm
-
+from typing import Callable, Iterable, List, Optional, Tuple
+from yt2txt.client import api_error, get_openai_client
 from yt2txt.config import Config
-from yt2txt.models import Transcript
+from yt2txt.models import CHARS_PER_TOKEN, Transcript
+
+
+# Minimum seconds between stream_callback calls while the analysis streams in
+STREAM_CALLBACK_INTERVAL = 0.25
+
+# Tokens of the context window kept free for the analysis itself (the completion);
+# the rest, less the system prompt, is the transcript budget of one request. Longer
+# transcripts are analyzed in parts and the partial analyses merged
+ANALYSIS_OUTPUT_RESERVE = 16_000
 
+# Room for the "(Part i of n of the transcript)" header and message framing
+ANALYSIS_REQUEST_OVERHEAD = 100
+
+# Content-keyed analysis cache: bounded in memory, written through to SQLite so it
+# survives restarts and is shared by every output directory
+ANALYSIS_CACHE_PATH = Path.home() / ".cache" / "yt2txt" / "analysis.sqlite"
+ANALYSIS_MEMORY_CACHE_SIZE = 64
+_analysis_memory_cache: "OrderedDict[str, str]" = OrderedDict()
+_analysis_cache_lock = threading.Lock()
 
 # Equity analysis system prompt
 EQUITY_ANALYSIS_PROMPT = """You are an expert equity analyst focused on U.S. and Canadian microcap companies. Your job is to extract forward-looking information, business trends, demand commentary, and operational signals from CEO interviews with extreme precision and zero hallucination.
@@ -124,6 +146,11 @@ Customer behaviour
 
 Only include quotes that have investment relevance."""
 
+# Instructions for combining the analyses of a transcript's parts
+MERGE_INSTRUCTIONS = """The transcript was too long to analyze in one request, so each part of it was analyzed separately. Below are the partial analyses, in transcript order.
+
+Combine them into a single analysis in exactly the format above. Merge duplicate points, keep verbatim quotes as they are, and use only information contained in the partial analyses."""
+
 
 def get_transcript_text(transcript: Transcript) -> str:
     """
@@ -135,13 +162,166 @@ def get_transcript_text(transcript: Transcript) -> str:
     Returns:
         Full transcript text
     """
-    return "\n".join(segment.text for segment in transcript.segments)
+    # Joined once per transcript and cached on it
+    return transcript.full_text
+
+
+@lru_cache(maxsize=None)
+def _token_encoding(model: str):
+    """tiktoken encoding for a model, or None if tiktoken isn't installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Model not known to this tiktoken version
+        return tiktoken.get_encoding("o200k_base")
+
+
+@lru_cache(maxsize=None)
+def _token_counter(model: str) -> Callable[[str], int]:
+    """
+    Token counting function for a model.
+    Uses tiktoken when it's installed, otherwise estimates from the text length.
+    """
+    encoding = _token_encoding(model)
+    if encoding is None:
+        # Rough estimate (see CHARS_PER_TOKEN)
+        return lambda text: len(text) // CHARS_PER_TOKEN + 1
+    return lambda text: len(encoding.encode_ordinary(text))
+
+
+def analysis_token_budget(model: str) -> int:
+    """
+    Maximum transcript tokens for one analysis request: the context window
+    (Config.CONTEXT_WINDOW) less the system prompt, the request overhead and
+    the room reserved for the completion.
+    """
+    prompt_tokens = _token_counter(model)(EQUITY_ANALYSIS_PROMPT)
+    budget = Config.CONTEXT_WINDOW - prompt_tokens - ANALYSIS_REQUEST_OVERHEAD - ANALYSIS_OUTPUT_RESERVE
+    # A misconfigured (tiny) window still makes progress, one small part at a time
+    return max(budget, 1_000)
+
+
+def _split_by_tokens(text: str, model: str, budget: int) -> List[str]:
+    """Split text into consecutive pieces of at most budget tokens, ignoring line breaks."""
+    encoding = _token_encoding(model)
+    if encoding is None:
+        # Matches the length-based estimate in _token_counter
+        step = max(budget - 1, 1) * CHARS_PER_TOKEN
+        return [text[i:i + step] for i in range(0, len(text), step)]
+    
+    tokens = encoding.encode_ordinary(text)
+    return [encoding.decode(tokens[i:i + budget]) for i in range(0, len(tokens), budget)]
+
+
+def split_to_token_budget(text: str, model: str, budget: int) -> List[str]:
+    """
+    Split text into pieces of at most budget tokens, breaking between lines
+    (transcript segments). A single line over the budget (e.g. an unsegmented
+    transcript) is itself split by tokens.
+    
+    Args:
+        text: Text to split
+        model: Model the text will be sent to (selects the tokenizer)
+        budget: Maximum tokens per piece
+        
+    Returns:
+        List of pieces - just [text] if it already fits
+    """
+    count_tokens = _token_counter(model)
+    if count_tokens(text) <= budget:
+        return [text]
+    
+    pieces = []
+    current = []
+    current_tokens = 0
+    for line in text.split("\n"):
+        line_tokens = count_tokens(line) + 1  # +1 for the newline
+        if line_tokens > budget:
+            if current:
+                pieces.append("\n".join(current))
+                current = []
+                current_tokens = 0
+            pieces.extend(_split_by_tokens(line, model, budget - 1))
+            continue
+        if current and current_tokens + line_tokens > budget:
+            pieces.append("\n".join(current))
+            current = []
+            current_tokens = 0
+        current.append(line)
+        current_tokens += line_tokens
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+@lru_cache(maxsize=None)
+def _prompt_hash() -> str:
+    """Hash of everything besides the transcript that shapes an analysis."""
+    return hashlib.sha1(
+        f"{EQUITY_ANALYSIS_PROMPT}\n{MERGE_INSTRUCTIONS}\n{Config.CONTEXT_WINDOW}\n{ANALYSIS_OUTPUT_RESERVE}".encode('utf-8')
+    ).hexdigest()
+
+
+def _analysis_cache_key(transcript_text: str, model: str) -> str:
+    """Cache key for an analysis: transcript content, model and prompt version."""
+    transcript_hash = hashlib.sha1(transcript_text.encode('utf-8')).hexdigest()
+    return f"{transcript_hash}:{model}:{_prompt_hash()}"
+
+
+def _load_cached_analysis(key: str) -> Optional[str]:
+    """Look up an analysis in memory, then in the SQLite cache."""
+    with _analysis_cache_lock:
+        if key in _analysis_memory_cache:
+            _analysis_memory_cache.move_to_end(key)
+            return _analysis_memory_cache[key]
+    
+    try:
+        with closing(sqlite3.connect(ANALYSIS_CACHE_PATH)) as conn:
+            row = conn.execute("SELECT analysis FROM analyses WHERE key = ?", (key,)).fetchone()
+    except (sqlite3.Error, OSError):
+        # No cache yet (or not readable) - treat as a miss
+        return None
+    if row is None:
+        return None
+    
+    _remember_analysis(key, row[0])
+    return row[0]
+
+
+def _store_cached_analysis(key: str, analysis_text: str) -> None:
+    """Save an analysis in memory and in the SQLite cache."""
+    _remember_analysis(key, analysis_text)
+    
+    try:
+        ANALYSIS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(ANALYSIS_CACHE_PATH)) as conn:
+            with conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS analyses (key TEXT PRIMARY KEY, analysis TEXT NOT NULL)")
+                conn.execute("INSERT OR REPLACE INTO analyses (key, analysis) VALUES (?, ?)", (key, analysis_text))
+    except (sqlite3.Error, OSError):
+        # Persistence is best effort - the in-memory copy still avoids repeat calls
+        pass
+
+
+def _remember_analysis(key: str, analysis_text: str) -> None:
+    """Add an analysis to the in-memory cache, evicting the least recently used."""
+    with _analysis_cache_lock:
+        _analysis_memory_cache[key] = analysis_text
+        _analysis_memory_cache.move_to_end(key)
+        while len(_analysis_memory_cache) > ANALYSIS_MEMORY_CACHE_SIZE:
+            _analysis_memory_cache.popitem(last=False)
 
 
 def analyze_transcript(
     transcript: Transcript,
     output_dir: Path,
-    force: bool = False
+    force: bool = False,
+    stream_callback: Optional[Callable[[str], None]] = None
 ) -> str:
     """
     Analyze transcript using OpenAI GPT API with equity analysis prompt.
@@ -150,6 +330,8 @@ def analyze_transcript(
         transcript: Transcript object with segments
         output_dir: Directory where analysis will be saved
         force: If True, re-analyze even if cached
+        stream_callback: Optional function called with the analysis text received
+            so far while the response streams in (e.g. for a live preview)
         
     Returns:
         Analysis text
@@ -160,156 +342,228 @@ def analyze_transcript(
     if not force and analysis_path.exists():
         print(f"✓ Using cached analysis")
         with open(analysis_path, 'r', encoding='utf-8') as f:
-            return f.read()
+            analysis_text = f.read()
+        if stream_callback is not None:
+            stream_callback(analysis_text)
+        return analysis_text
+    
+    # Same transcript already analyzed elsewhere (e.g. another output directory)
+    cache_key = _analysis_cache_key(get_transcript_text(transcript), Config.ANALYSIS_MODEL)
+    if not force:
+        analysis_text = _load_cached_analysis(cache_key)
+        if analysis_text is not None:
+            print("✓ Using cached analysis")
+            if stream_callback is not None:
+                stream_callback(analysis_text)
+            return analysis_text
     
+    analysis_text = run_analysis(transcript, stream_callback)
+    _store_cached_analysis(cache_key, analysis_text)
+    return analysis_text
+
+
+def run_analysis(
+    transcript: Transcript,
+    stream_callback: Optional[Callable[[str], None]] = None
+) -> str:
+    """
+    Run the equity analysis GPT request, without checking for a saved analysis.
+    The CLI and the Streamlit app go through analyze_transcript, so they share its
+    caches; use this only to force a fresh, uncached analysis.
+    
+    Args:
+        transcript: Transcript object with segments
+        stream_callback: Optional function called with the analysis text received
+            so far while the response streams in
+        
+    Returns:
+        Analysis text
+    """
     # Validate API key
     Config.validate()
     
-    # Initialize OpenAI client
-    client = OpenAI(
-        api_key=Config.OPENAI_API_KEY,
-        timeout=300.0  # 5 minute timeout
-    )
+    # Shared OpenAI client (reuses its connection pool across calls), 5 minute timeout,
+    # with the SDK's own retries for transient errors
+    client = get_openai_client().with_options(timeout=300.0, max_retries=Config.MAX_RETRIES)
     
     # Get transcript text
     transcript_text = get_transcript_text(transcript)
     
-    # Prepare the full prompt
-    user_message = f"{EQUITY_ANALYSIS_PROMPT}\n\nUSER: {transcript_text}"
-    
     # Get analysis model from config
     analysis_model = Config.ANALYSIS_MODEL
     
-    # Analyze with retries
-    last_error = None
-    for attempt in range(Config.MAX_RETRIES + 1):
-        try:
-            if attempt > 0:
-                print(f"Analyzing transcript (attempt {attempt + 1}/{Config.MAX_RETRIES + 1})...")
-            else:
-                print("Analyzing transcript with GPT...")
-            
-            # Create progress bar
-            with tqdm(
-                total=100,
-                desc="Analyzing",
-                unit="%",
-                bar_format="{desc}: {percentage:3.0f}%|{bar}| {elapsed}",
-                ncols=80,
-                leave=False
-            ) as pbar:
-                # Simulate progress
-                progress_complete = False
-                
-                def update_progress():
-                    """Simulate progress since API doesn't provide real-time updates."""
-                    nonlocal progress_complete
-                    current = 0
-                    while not progress_complete and current < 95:
-                        time.sleep(0.2)
-                        current = min(current + 2, 95)
-                        pbar.n = int(current)
-                        pbar.refresh()
-                
-                import threading
-                progress_thread = threading.Thread(target=update_progress, daemon=True)
-                progress_thread.start()
-                
-                try:
-                    # Prepare request parameters
-                    request_params = {
-                        "model": analysis_model,
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": user_message
-                            }
-                        ]
-                    }
-                    
-                    # Only set temperature if model supports it (gpt-5-nano only supports default)
-                    if not analysis_model.startswith("gpt-5"):
-                        request_params["temperature"] = 0.3  # Lower temperature for more precise analysis
-                    
-                    response = client.chat.completions.create(**request_params)
-                    
-                    progress_complete = True
-                    pbar.n = 100
-                    pbar.refresh()
-                    progress_thread.join(timeout=0.5)
-                except Exception as e:
-                    progress_complete = True
-                    progress_thread.join(timeout=0.5)
+    # Long transcripts are analyzed in parts that each fit the token budget, then merged
+    token_budget = analysis_token_budget(analysis_model)
+    pieces = split_to_token_budget(transcript_text, analysis_model, token_budget)
+    if len(pieces) == 1:
+        print("Analyzing transcript with GPT...")
+        return _request_analysis(client, analysis_model, transcript_text, stream_callback)
+    
+    print(f"Transcript exceeds {token_budget} tokens - analyzing it in {len(pieces)} parts...")
+    partial_analyses = []
+    for i, piece in enumerate(pieces, start=1):
+        print(f"Analyzing part {i}/{len(pieces)} with GPT...")
+        partial_analyses.append(_request_analysis(
+            client, analysis_model, f"(Part {i} of {len(pieces)} of the transcript)\n\n{piece}"
+        ))
+    
+    print("Merging partial analyses...")
+    merge_message = MERGE_INSTRUCTIONS + "\n\n" + "\n\n".join(
+        f"PARTIAL ANALYSIS {i}:\n{partial}" for i, partial in enumerate(partial_analyses, start=1)
+    )
+    return _request_analysis(client, analysis_model, merge_message, stream_callback)
+
+
+def _request_analysis(
+    client,
+    analysis_model: str,
+    user_content: str,
+    stream_callback: Optional[Callable[[str], None]] = None
+) -> str:
+    """
+    Send one equity analysis request, with retries.
+    
+    Args:
+        client: OpenAI client
+        analysis_model: Model to use
+        user_content: Transcript text (or partial analyses to merge)
+        stream_callback: Optional function called with the text received so far
+        
+    Returns:
+        Response text
+    """
+    # Imported here so modules that only need get_transcript_text (chat prefix,
+    # formatter) don't pay for openai/httpx/tqdm at import time
+    import httpx
+    from openai import APIError
+    from tqdm import tqdm
+    
+    # Prompt and transcript go in separate messages: the prompt is then an identical
+    # prefix on every call (cacheable server-side) and is never copied into the transcript
+    messages = [
+        {
+            "role": "system",
+            "content": EQUITY_ANALYSIS_PROMPT
+        },
+        {
+            "role": "user",
+            "content": user_content
+        }
+    ]
+    
+    # Prepare request parameters
+    request_params = {
+        "model": analysis_model,
+        "messages": messages,
+        "stream": True
+    }
+    
+    # Only set temperature if model supports it (gpt-5-nano only supports default)
+    if not analysis_model.startswith("gpt-5"):
+        request_params["temperature"] = 0.3  # Lower temperature for more precise analysis
+    
+    # Rate limits, connection errors and 5xx responses before the response starts are
+    # retried by the client (max_retries, exponential backoff honoring Retry-After).
+    # The client can't retry a stream that breaks partway through, so that is done here.
+    try:
+        for attempt in range(Config.MAX_RETRIES + 1):
+            # Stream the response so progress reflects the text actually received
+            parts = []
+            last_callback = 0.0
+            stream_started = False
+            try:
+                with tqdm(
+                    desc="Analyzing",
+                    unit=" chars",
+                    ncols=80,
+                    leave=False
+                ) as pbar:
+                    stream = client.chat.completions.create(**request_params)
+                    stream_started = True
+                    for chunk in stream:
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content
+                        if not delta:
+                            continue
+                        parts.append(delta)
+                        pbar.update(len(delta))
+                        
+                        # Hand the partial text to the caller, throttled so the join stays cheap
+                        if stream_callback is not None:
+                            now = time.monotonic()
+                            if now - last_callback >= STREAM_CALLBACK_INTERVAL:
+                                stream_callback("".join(parts))
+                                last_callback = now
+                break
+            except (APIError, httpx.TransportError) as e:
+                # Dropped connections and server errors mid-stream restart the request;
+                # anything else (or running out of attempts) is reported below
+                status_code = getattr(e, 'status_code', None)
+                is_transient = not isinstance(e, APIError) or status_code is None or status_code >= 500
+                if not (stream_started and is_transient) or attempt >= Config.MAX_RETRIES:
                     raise
-            
-            # Extract analysis text
-            analysis_text = response.choices[0].message.content
-            
-            print(f"✓ Analysis complete")
-            return analysis_text
-            
-        except RateLimitError as e:
-            last_error = e
-            if attempt < Config.MAX_RETRIES:
-                wait_time = 2 ** attempt  # Exponential backoff
-                print(f"Rate limit hit. Waiting {wait_time} seconds before retry...")
-                time.sleep(wait_time)
-                continue
-            else:
-                raise RuntimeError(
-                    f"Rate limit exceeded after {Config.MAX_RETRIES + 1} attempts. "
-                    f"Please try again later."
-                ) from e
-                
-        except APIConnectionError as e:
-            last_error = e
-            if attempt < Config.MAX_RETRIES:
                 wait_time = 2 ** attempt
-                print(f"Connection error. Waiting {wait_time} seconds before retry...")
+                print(f"\nAnalysis stream interrupted. Retrying in {wait_time} seconds...")
                 time.sleep(wait_time)
-                continue
-            else:
-                raise RuntimeError(
-                    f"Connection error after {Config.MAX_RETRIES + 1} attempts: {str(e)}"
-                ) from e
-                
-        except APIError as e:
-            error_msg = str(e)
-            
-            # Check if it's an HTML response (502/503 gateway errors)
-            is_html_error = "<!DOCTYPE html>" in error_msg or "<html" in error_msg.lower()
-            is_5xx_error = hasattr(e, 'status_code') and e.status_code and 500 <= e.status_code < 600
-            
-            # Retry on 5xx server errors (including 502 Bad Gateway)
-            if (is_html_error or is_5xx_error) and attempt < Config.MAX_RETRIES:
-                last_error = e
-                wait_time = 2 ** attempt
-                if is_html_error:
-                    print(f"Server error (502 Bad Gateway). Waiting {wait_time} seconds before retry...")
-                else:
-                    print(f"Server error ({getattr(e, 'status_code', '5xx')}). Waiting {wait_time} seconds before retry...")
-                time.sleep(wait_time)
-                continue
-            
-            # Non-retryable API errors
-            if "quota" in error_msg.lower() or "billing" in error_msg.lower():
-                raise RuntimeError(
-                    f"OpenAI API quota/billing error: {error_msg}. "
-                    f"Please check your OpenAI account."
-                ) from e
-            
-            # Clean up HTML error messages
-            if is_html_error:
-                raise RuntimeError(
-                    "OpenAI API server error (502 Bad Gateway). "
-                    "This is a temporary issue on OpenAI's servers. Please try again in a few minutes."
-                ) from e
-            
-            raise RuntimeError(f"OpenAI API error: {error_msg}") from e
-            
-        except Exception as e:
-            raise RuntimeError(f"Unexpected error during analysis: {str(e)}") from e
+        
+        analysis_text = "".join(parts)
+        if stream_callback is not None:
+            stream_callback(analysis_text)
+        
+        print(f"✓ Analysis complete")
+        return analysis_text
+        
+    except (APIError, httpx.TransportError) as e:
+        raise api_error(e) from e
+        
+    except Exception as e:
+        raise RuntimeError(f"Unexpected error during analysis: {str(e)}") from e
+
+
+async def analyze_transcript_async(
+    transcript: Transcript,
+    output_dir: Path,
+    force: bool = False
+) -> str:
+    """
+    Async version of analyze_transcript, for analyzing several videos at once.
     
-    # Should not reach here, but just in case
-    raise RuntimeError(f"Failed to analyze after {Config.MAX_RETRIES + 1} attempts") from last_error
+    Runs the blocking call in a worker thread, so the retry handling and the
+    shared client's connection pool are the same as for analyze_transcript.
+    
+    Args:
+        transcript: Transcript object with segments
+        output_dir: Directory where analysis will be saved
+        force: If True, re-analyze even if cached
+        
+    Returns:
+        Analysis text
+    """
+    return await asyncio.to_thread(analyze_transcript, transcript, output_dir, force)
 
+
+async def analyze_many(
+    jobs: Iterable[Tuple[Transcript, Path]],
+    force: bool = False
+) -> List[str]:
+    """
+    Analyze several transcripts concurrently.
+    
+    At most Config.MAX_CONCURRENT_ANALYSIS requests are in flight at once,
+    to stay within OpenAI rate limits.
+    
+    Args:
+        jobs: (transcript, output_dir) pairs
+        force: If True, re-analyze even if cached
+        
+    Returns:
+        Analysis texts, in the same order as jobs
+    """
+    semaphore = asyncio.Semaphore(max(1, Config.MAX_CONCURRENT_ANALYSIS))
+    
+    async def run(transcript: Transcript, output_dir: Path) -> str:
+        async with semaphore:
+            return await analyze_transcript_async(transcript, output_dir, force)
+    
+    return await asyncio.gather(*(run(transcript, output_dir) for transcript, output_dir in jobs))
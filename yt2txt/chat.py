@@ -1,48 +1,301 @@
 """Interactive chat interface for asking questions about transcripts."""
 
-from typing import List, Dict
-from openai import OpenAI
-from openai import APIError, RateLimitError, APIConnectionError
-import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, List, Dict, Optional
+import re
 
+from yt2txt.client import api_error, get_openai_client
 from yt2txt.config import Config
-from yt2txt.models import Transcript
+from yt2txt.models import CHARS_PER_TOKEN, Transcript
 from yt2txt.analyzer import get_transcript_text
 
 
-def start_chat_session(transcript: Transcript) -> None:
+# System prompt for transcript Q&A
+CHAT_SYSTEM_PROMPT = "You are an expert equity analyst analyzing a CEO interview transcript. Answer questions based on the transcript content. If the transcript doesn't contain the information, say so. Never guess or make up information."
+
+# Chat history is trimmed once the request would exceed this share of the context window
+CONTEXT_TRIM_RATIO = 0.8
+
+# A trim frees this share of the history's room at once ("over-pruning"), so the next
+# several turns send an unchanged prefix and keep hitting OpenAI's prompt cache
+# instead of a one-pair trim shifting the conversation on every turn
+HISTORY_PRUNE_FRACTION = 0.5
+
+# CLI command for asking several independent questions at once: "/parallel q1 || q2"
+PARALLEL_COMMAND = "/parallel"
+
+# One "[index] answer" block of a batched response, up to the next tag on a new line
+_RE_BATCHED_ANSWER = re.compile(r"^\[(\d+)\]\s*(.+?)(?=\n\[\d+\]|\Z)", re.MULTILINE | re.DOTALL)
+
+
+def build_chat_prefix(transcript_text: str) -> List[Dict[str, str]]:
     """
-    Start an interactive chat session where user can ask questions about the transcript.
+    Build the fixed leading messages of a chat: system prompt, then the transcript.
+    Conversation turns go strictly after this prefix, so it stays byte-identical
+    across turns and OpenAI's automatic prompt caching can reuse it.
     
     Args:
-        transcript: Transcript object with segments
+        transcript_text: Full transcript text
+        
+    Returns:
+        List of message dicts
     """
-    # Validate API key
-    Config.validate()
-    
-    # Initialize OpenAI client
-    client = OpenAI(
-        api_key=Config.OPENAI_API_KEY,
-        timeout=300.0
-    )
-    
-    # Get transcript text
-    transcript_text = get_transcript_text(transcript)
-    
-    # Get analysis model from config
-    analysis_model = Config.ANALYSIS_MODEL
-    
-    # Initialize conversation with transcript as context
-    messages: List[Dict[str, str]] = [
+    return [
         {
             "role": "system",
-            "content": "You are an expert equity analyst analyzing a CEO interview transcript. Answer questions based on the transcript content. If the transcript doesn't contain the information, say so. Never guess or make up information."
+            "content": CHAT_SYSTEM_PROMPT
         },
         {
             "role": "user",
             "content": f"Here is the transcript from a CEO interview:\n\n{transcript_text}"
         }
     ]
+
+
+def _char_tokens(message: Dict[str, str]) -> int:
+    """Approximate token count of a chat message, from its length."""
+    return len(message["content"]) // CHARS_PER_TOKEN + 1
+
+
+def build_batched_question(questions: List[str]) -> str:
+    """
+    Combine several questions into one user message, so they can be answered
+    with a single request (the transcript prefix is only paid for once).
+    
+    Args:
+        questions: Questions in the order they were asked
+    
+    Returns:
+        User message asking for one [index]-tagged answer per question
+    """
+    numbered = "\n".join(f"[{i}] {question}" for i, question in enumerate(questions, start=1))
+    return (
+        "Answer each of the following questions separately. "
+        "Start each answer on a new line with the question's [index] tag.\n"
+        f"{numbered}"
+    )
+
+
+def split_batched_answer(response_text: str, count: int) -> Optional[List[str]]:
+    """
+    Split a response to build_batched_question back into per-question answers.
+    
+    Args:
+        response_text: Model response
+        count: Number of questions that were batched
+    
+    Returns:
+        List of answers in question order, or None if the response doesn't
+        contain exactly one answer per question
+    """
+    answers = {}
+    for match in _RE_BATCHED_ANSWER.finditer(response_text):
+        answers[int(match.group(1))] = match.group(2).strip()
+    if sorted(answers) != list(range(1, count + 1)):
+        return None
+    return [answers[i] for i in range(1, count + 1)]
+
+
+def _ask_question(client, model: str, messages: List[Dict[str, str]]) -> str:
+    """
+    Send one non-streamed chat request and return the answer text.
+    
+    Args:
+        client: OpenAI client (retries transient errors itself)
+        model: Model to use
+        messages: Full message list, ending with the question
+    
+    Returns:
+        Answer text
+    """
+    request_params = {
+        "model": model,
+        "messages": messages
+    }
+    
+    # Only set temperature if model supports it
+    if not model.startswith("gpt-5"):
+        request_params["temperature"] = 0.3
+    
+    response = client.chat.completions.create(**request_params)
+    return response.choices[0].message.content or ""
+
+
+class ChatSession:
+    """
+    Question/answer conversation about one transcript.
+    
+    The prefix (system prompt + transcript) is built once and pinned; later turns are
+    kept in a rolling window, oldest question/answer pairs dropped when over the token
+    budget. Sessions share the process-wide OpenAI client and its connection pool.
+    """
+    
+    __slots__ = (
+        'client', 'model', 'prefix', 'prefix_tokens', 'history', 'history_tokens',
+        'token_budget', 'prune_target'
+    )
+    
+    def __init__(self, transcript: Transcript):
+        """
+        Args:
+            transcript: Transcript object with segments
+        """
+        # Validate API key
+        Config.validate()
+        
+        # Shared OpenAI client (reuses its connection pool across turns and sessions), 5 minute
+        # timeout; the client retries rate limits, connection and 5xx errors itself
+        self.client = get_openai_client().with_options(timeout=300.0, max_retries=Config.MAX_RETRIES)
+        self.model = Config.ANALYSIS_MODEL
+        
+        self.prefix: List[Dict[str, str]] = build_chat_prefix(get_transcript_text(transcript))
+        # The transcript's estimate is kept on the Transcript, so it's computed once per process
+        # (the one-line lead-in before the transcript is negligible)
+        self.prefix_tokens = _char_tokens(self.prefix[0]) + transcript.approx_tokens
+        self.history: Deque[Dict[str, str]] = deque()
+        self.history_tokens = 0
+        self.token_budget = int(CONTEXT_TRIM_RATIO * Config.CONTEXT_WINDOW)
+        # Relative to the room left after the prefix, since a long transcript alone can be
+        # most of the window
+        self.prune_target = self.token_budget - int(
+            HISTORY_PRUNE_FRACTION * max(self.token_budget - self.prefix_tokens, 0)
+        )
+    
+    def reset(self) -> None:
+        """Forget the conversation so far (the transcript prefix is kept)."""
+        self.history.clear()
+        self.history_tokens = 0
+    
+    def make_room(self, question: str) -> bool:
+        """
+        Once asking question would go over budget, drop the oldest question/answer pairs
+        (never half a pair) down to the prune target, well below the budget.
+        
+        Args:
+            question: Question about to be asked
+        
+        Returns:
+            True if earlier turns were dropped
+        """
+        needed = self.prefix_tokens + len(question) // CHARS_PER_TOKEN + 1
+        if needed + self.history_tokens <= self.token_budget:
+            return False
+        
+        trimmed = False
+        while self.history and needed + self.history_tokens > self.prune_target:
+            for _ in range(2):
+                self.history_tokens -= _char_tokens(self.history.popleft())
+            trimmed = True
+        return trimmed
+    
+    def _record(self, question: str, answer: str) -> None:
+        """Add an answered question to the history."""
+        for message in ({"role": "user", "content": question}, {"role": "assistant", "content": answer}):
+            self.history.append(message)
+            self.history_tokens += _char_tokens(message)
+    
+    def ask(self, question: str, on_delta: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Ask a question, streaming the answer.
+        
+        The question only joins the history once it has been answered, so a failed
+        turn leaves nothing to undo.
+        
+        Args:
+            question: Question about the transcript
+            on_delta: Optional callback receiving each piece of the answer as it arrives
+        
+        Returns:
+            Full answer text
+        """
+        from openai import APIError
+        
+        self.make_room(question)
+        
+        # One shallow list of references: the prefix dicts (and the transcript string
+        # inside them) are shared, never copied
+        messages = [*self.prefix, *self.history, {"role": "user", "content": question}]
+        
+        # Prepare request parameters
+        request_params = {
+            "model": self.model,
+            "messages": messages,
+            "stream": True
+        }
+        
+        # Only set temperature if model supports it
+        if not self.model.startswith("gpt-5"):
+            request_params["temperature"] = 0.3
+        
+        # The client retries starting the stream (a stream that fails midway isn't retried)
+        try:
+            stream = self.client.chat.completions.create(**request_params)
+        except APIError as e:
+            raise api_error(e) from e
+        
+        response_parts = []
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if on_delta is not None:
+                on_delta(delta)
+            response_parts.append(delta)
+        response_text = "".join(response_parts)
+        
+        if not response_text:
+            raise RuntimeError("Failed to get response from API")
+        
+        self._record(question, response_text)
+        return response_text
+    
+    def ask_parallel(self, questions: List[str]) -> List[str]:
+        """
+        Ask independent questions at once: one request each, all in flight together,
+        so the wait is the slowest answer rather than the sum of them.
+        
+        Args:
+            questions: Questions that don't depend on each other's answers
+        
+        Returns:
+            Answers in question order
+        """
+        from openai import APIError
+        
+        # Make room for the whole batch, since all of it joins the history
+        self.make_room("\n".join(questions))
+        
+        base_messages = [*self.prefix, *self.history]
+        with ThreadPoolExecutor(max_workers=len(questions)) as executor:
+            futures = [
+                executor.submit(
+                    _ask_question, self.client, self.model,
+                    base_messages + [{"role": "user", "content": q}]
+                )
+                for q in questions
+            ]
+            try:
+                answers = [future.result() for future in futures]
+            except APIError as e:
+                # The client has already retried; report it the same way as ask()
+                raise api_error(e) from e
+        
+        for q, answer in zip(questions, answers):
+            self._record(q, answer)
+        return answers
+
+
+def start_chat_session(transcript: Transcript) -> None:
+    """
+    Start an interactive chat session where user can ask questions about the transcript.
+    
+    Args:
+        transcript: Transcript object with segments
+    """
+    session = ChatSession(transcript)
     
     print()
     print("=" * 60)
@@ -51,10 +304,20 @@ def start_chat_session(transcript: Transcript) -> None:
     print()
     print("You can now ask questions about the transcript.")
     print("The AI has access to the full transcript and will answer based on it.")
+    print(f"Type '{PARALLEL_COMMAND} question 1 || question 2' to ask independent questions at once.")
     print("Type 'quit', 'exit', or 'q' to end the session.")
     print()
     
-    conversation_count = 0
+    answer_started = False
+    
+    def print_delta(delta: str) -> None:
+        """Print the answer as it arrives instead of after the whole generation."""
+        nonlocal answer_started
+        if not answer_started:
+            # Replace "Thinking..." with the answer
+            print("\r" + " " * 50 + "\rAI: ", end="")
+            answer_started = True
+        print(delta, end="", flush=True)
     
     while True:
         try:
@@ -69,111 +332,27 @@ def start_chat_session(transcript: Transcript) -> None:
                 print("\nEnding chat session. Goodbye!")
                 break
             
-            # Add user question to conversation
-            messages.append({
-                "role": "user",
-                "content": question
-            })
+            if question.startswith(PARALLEL_COMMAND):
+                questions = [q.strip() for q in question[len(PARALLEL_COMMAND):].split("||") if q.strip()]
+                if not questions:
+                    print(f"Usage: {PARALLEL_COMMAND} question 1 || question 2\n")
+                    continue
+                
+                if session.make_room("\n".join(questions)):
+                    print("(Earlier questions were dropped to keep the conversation within the model's context window)")
+                print(f"Thinking about {len(questions)} questions...", flush=True)
+                for q, answer in zip(questions, session.ask_parallel(questions)):
+                    print(f"\nQ: {q}\nAI: {answer}\n")
+                continue
+            
+            if session.make_room(question):
+                print("(Earlier questions were dropped to keep the conversation within the model's context window)")
             
             # Show thinking indicator
             print("Thinking...", end="", flush=True)
-            
-            # Get response with retries
-            response_text = None
-            last_error = None
-            
-            for attempt in range(Config.MAX_RETRIES + 1):
-                try:
-                    # Prepare request parameters
-                    request_params = {
-                        "model": analysis_model,
-                        "messages": messages
-                    }
-                    
-                    # Only set temperature if model supports it
-                    if not analysis_model.startswith("gpt-5"):
-                        request_params["temperature"] = 0.3
-                    
-                    response = client.chat.completions.create(**request_params)
-                    response_text = response.choices[0].message.content
-                    break
-                    
-                except RateLimitError as e:
-                    last_error = e
-                    if attempt < Config.MAX_RETRIES:
-                        wait_time = 2 ** attempt
-                        print(f"\nRate limit hit. Waiting {wait_time} seconds...")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        raise RuntimeError(
-                            f"Rate limit exceeded after {Config.MAX_RETRIES + 1} attempts. "
-                            f"Please try again later."
-                        ) from e
-                        
-                except APIConnectionError as e:
-                    last_error = e
-                    if attempt < Config.MAX_RETRIES:
-                        wait_time = 2 ** attempt
-                        print(f"\nConnection error. Waiting {wait_time} seconds...")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        raise RuntimeError(
-                            f"Connection error after {Config.MAX_RETRIES + 1} attempts: {str(e)}"
-                        ) from e
-                        
-                except APIError as e:
-                    error_msg = str(e)
-                    
-                    # Check if it's an HTML response (502/503 gateway errors)
-                    is_html_error = "<!DOCTYPE html>" in error_msg or "<html" in error_msg.lower()
-                    is_5xx_error = hasattr(e, 'status_code') and e.status_code and 500 <= e.status_code < 600
-                    
-                    # Retry on 5xx server errors
-                    if (is_html_error or is_5xx_error) and attempt < Config.MAX_RETRIES:
-                        last_error = e
-                        wait_time = 2 ** attempt
-                        if is_html_error:
-                            print(f"\nServer error (502 Bad Gateway). Waiting {wait_time} seconds...")
-                        else:
-                            print(f"\nServer error ({getattr(e, 'status_code', '5xx')}). Waiting {wait_time} seconds...")
-                        time.sleep(wait_time)
-                        continue
-                    
-                    # Non-retryable API errors
-                    if "quota" in error_msg.lower() or "billing" in error_msg.lower():
-                        raise RuntimeError(
-                            f"OpenAI API quota/billing error: {error_msg}. "
-                            f"Please check your OpenAI account."
-                        ) from e
-                    
-                    if is_html_error:
-                        raise RuntimeError(
-                            "OpenAI API server error (502 Bad Gateway). "
-                            "This is a temporary issue on OpenAI's servers. Please try again in a few minutes."
-                        ) from e
-                    
-                    raise RuntimeError(f"OpenAI API error: {error_msg}") from e
-            
-            if response_text:
-                # Clear "Thinking..." and show response
-                print("\r" + " " * 50 + "\r", end="")  # Clear line
-                print(f"AI: {response_text}\n")
-                
-                # Add assistant response to conversation history
-                messages.append({
-                    "role": "assistant",
-                    "content": response_text
-                })
-                
-                conversation_count += 1
-                
-                # Warn if conversation is getting long (to avoid token limits)
-                if conversation_count > 20:
-                    print("⚠ Note: Long conversation detected. Consider starting a new session for better performance.\n")
-            else:
-                raise RuntimeError("Failed to get response from API")
+            answer_started = False
+            session.ask(question, on_delta=print_delta)
+            print("\n")
                 
         except KeyboardInterrupt:
             print("\n\nInterrupted by user. Ending chat session.")
@@ -181,7 +360,3 @@ def start_chat_session(transcript: Transcript) -> None:
         except Exception as e:
             print(f"\n✗ Error: {str(e)}")
             print("You can continue asking questions or type 'quit' to exit.\n")
-            # Remove the last user message if there was an error
-            if messages and messages[-1]["role"] == "user":
-                messages.pop()
-
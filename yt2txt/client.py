@@ -0,0 +1,135 @@
+"""Shared OpenAI client so all API calls reuse one connection pool."""
+
+import atexit
+import re
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from yt2txt.config import Config
+
+if TYPE_CHECKING:
+    import httpx
+    from openai import OpenAI
+
+
+# Idle connections are kept for a minute (httpx's default is 5 seconds), so chat
+# turns a user spends reading or typing don't each pay for a new TLS handshake
+KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+# API error classification (case-insensitive search, no lowercased copy of large HTML bodies)
+_RE_HTML_ERROR = re.compile(r"<!DOCTYPE html>|<html", re.IGNORECASE)
+# Gateway error pages start with their markup, so only this much of the message is scanned
+HTML_ERROR_SCAN_CHARS = 256
+_RE_QUOTA_ERROR = re.compile(r"quota|billing", re.IGNORECASE)
+
+_client: Optional["OpenAI"] = None
+_client_api_key: Optional[str] = None
+_http_client: Optional["httpx.Client"] = None
+_client_lock = threading.Lock()
+
+
+def _get_http_client() -> "httpx.Client":
+    """
+    The HTTP connection pool behind the OpenAI client (call with _client_lock held).
+    Created once per process, so a new API key doesn't mean new connections or SSL setup.
+    """
+    global _http_client
+    
+    if _http_client is None:
+        import httpx
+        _http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS
+            ),
+            follow_redirects=True
+        )
+        atexit.register(_http_client.close)
+    return _http_client
+
+
+def get_openai_client() -> "OpenAI":
+    """
+    Get the process-wide OpenAI client, creating it on first use.
+    
+    The client is rebuilt if Config.OPENAI_API_KEY changes (e.g. after Streamlit
+    secrets are loaded). Use client.with_options(timeout=...) for per-call
+    timeouts - the copy shares the same underlying connection pool.
+    
+    Returns:
+        OpenAI client
+    """
+    global _client, _client_api_key
+    
+    # openai pulls in httpx/pydantic, so it's imported on first use rather than with this module
+    from openai import OpenAI
+    
+    with _client_lock:
+        if _client is None or _client_api_key != Config.OPENAI_API_KEY:
+            _client = OpenAI(api_key=Config.OPENAI_API_KEY, http_client=_get_http_client())
+            _client_api_key = Config.OPENAI_API_KEY
+        return _client
+
+
+def warm_up_client() -> None:
+    """
+    Open a connection to the OpenAI API ahead of the first real request,
+    so DNS lookup and TLS handshake are off the user-visible path.
+    """
+    if not Config.OPENAI_API_KEY:
+        return
+    
+    try:
+        get_openai_client().models.list()
+    except Exception:
+        # Warm-up is best effort - real requests report their own errors
+        pass
+
+
+def is_html_error(error_msg: str) -> bool:
+    """True if an API error message is an HTML error page (502/503 gateway errors)."""
+    return _RE_HTML_ERROR.search(error_msg, 0, HTML_ERROR_SCAN_CHARS) is not None
+
+
+def api_error(error: Exception) -> RuntimeError:
+    """
+    User-facing error for an OpenAI API error that won't be retried (any further).
+    
+    Args:
+        error: Exception raised by the OpenAI client (or the HTTP transport under it)
+    
+    Returns:
+        RuntimeError with a readable message (raise it "from error")
+    """
+    import httpx
+    from openai import APIError, APIConnectionError, RateLimitError
+    
+    if isinstance(error, RateLimitError):
+        return RuntimeError(
+            f"Rate limit exceeded after {Config.MAX_RETRIES + 1} attempts. "
+            f"Please try again later."
+        )
+    
+    if isinstance(error, (APIConnectionError, httpx.TransportError)):
+        return RuntimeError(f"Connection error after {Config.MAX_RETRIES + 1} attempts: {str(error)}")
+    
+    if isinstance(error, APIError):
+        error_msg = str(error)
+        
+        if _RE_QUOTA_ERROR.search(error_msg):
+            return RuntimeError(
+                f"OpenAI API quota/billing error: {error_msg}. "
+                f"Please check your OpenAI account."
+            )
+        
+        # Clean up HTML error messages
+        if is_html_error(error_msg):
+            return RuntimeError(
+                "OpenAI API server error (502 Bad Gateway). "
+                "This is a temporary issue on OpenAI's servers. Please try again in a few minutes."
+            )
+        
+        return RuntimeError(f"OpenAI API error: {error_msg}")
+    
+    return RuntimeError(f"Unexpected error: {str(error)}")
@@ -17,11 +17,15 @@ class Config:
     MODEL: str = os.getenv("MODEL", "whisper-1")
     ANALYSIS_MODEL: str = os.getenv("ANALYSIS_MODEL", "gpt-4o-mini")
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "2"))
+    MAX_CONCURRENT_ANALYSIS: int = int(os.getenv("MAX_CONCURRENT_ANALYSIS", "8"))
+    CONTEXT_WINDOW: int = int(os.getenv("CONTEXT_WINDOW", "128000"))  # ANALYSIS_MODEL's context window, in tokens
     OUT_DIR: Path = Path(os.getenv("OUT_DIR", "./out")).resolve()
     
     # YouTube cookies for bypassing bot detection (optional)
     # Set to path of cookies.txt file exported from browser
     YOUTUBE_COOKIES_TXT: str = os.getenv("YOUTUBE_COOKIES_TXT", "")
+    # Retry a failed cookie download with each player client separately (slower)
+    AGGRESSIVE_RETRY: bool = os.getenv("YT2TXT_AGGRESSIVE_RETRY", "") == "1"
     
     @classmethod
     def validate(cls) -> None:
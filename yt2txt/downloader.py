@@ -1,34 +1,44 @@
 """YouTube audio downloader using yt-dlp."""
 
+import atexit
+import hashlib
 import os
 import re
-import json
 import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, Optional, Tuple, List
-import yt_dlp
+import orjson
 from yt2txt.config import Config
 
-# Check yt-dlp version for debugging
-try:
-    import yt_dlp.version
-    YT_DLP_VERSION = yt_dlp.version.__version__
-except:
-    try:
-        YT_DLP_VERSION = yt_dlp.__version__
-    except:
-        YT_DLP_VERSION = "unknown"
+# Range-request size for HTTP downloads (10 MB)
+HTTP_CHUNK_SIZE = 10 * 1024 * 1024
+
+# Number of fragments downloaded in parallel for DASH/HLS formats
+CONCURRENT_FRAGMENTS = 4
+
+# Number of videos download_audio_batch downloads at once
+BATCH_DOWNLOAD_WORKERS = 4
+
+# URL patterns for extract_video_id, tried in order (compiled once at import)
+_VIDEO_ID_PATTERNS = (
+    re.compile(r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)'),
+    re.compile(r'youtube\.com\/watch\?.*v=([^&\n?#]+)'),
+)
+
+# Patterns used by slugify
+_SLUG_COMPANY_RE = re.compile(r'^([^|]+?)(?:\s+Webcast|\s*\|)')
+# Maps remaining colons to dashes and drops the other Windows-invalid characters in one pass
+_SLUG_TRANSLATION = str.maketrans({':': '-', '<': None, '>': None, '"': None, '\\': None, '?': None, '*': None})
+_SLUG_WHITESPACE_RE = re.compile(r'\s+')
 
 
 def extract_video_id(url: str) -> str:
     """Extract video ID from various YouTube URL formats."""
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)',
-        r'youtube\.com\/watch\?.*v=([^&\n?#]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
+    for pattern in _VIDEO_ID_PATTERNS:
+        match = pattern.search(url)
         if match:
             return match.group(1)
     
@@ -42,7 +52,7 @@ def slugify(text: str) -> str:
     
     # Try to extract company name if there's a pattern like "Company Inc. (SYMBOL)"
     # Look for patterns like "Company Name (TSX-V: SYMBOL" or stop at "Webcast" or "|"
-    company_match = re.match(r'^([^|]+?)(?:\s+Webcast|\s*\|)', text)
+    company_match = _SLUG_COMPANY_RE.match(text)
     if company_match:
         text = company_match.group(1).strip()
     else:
@@ -56,16 +66,185 @@ def slugify(text: str) -> str:
     # Remove only truly problematic Windows filesystem characters
     # Windows doesn't allow : in folder names, so replace with dash (make it readable)
     text = text.replace(': ', ' - ')  # Replace colon+space with dash+space for readability
-    text = text.replace(':', '-')  # Replace any remaining colons
-    text = re.sub(r'[<>"\\?*]', '', text)  # Remove other Windows-invalid characters
+    text = text.translate(_SLUG_TRANSLATION)  # Remaining colons -> dashes, remove other invalid characters
     # Replace multiple spaces with single space
-    text = re.sub(r'\s+', ' ', text)
+    text = _SLUG_WHITESPACE_RE.sub(' ', text)
     # Trim to reasonable length (80 chars)
     text = text.strip()[:80]
     
     return text
 
 
+def _stat_or_none(path) -> Optional[os.stat_result]:
+    """os.stat(path), or None if it doesn't exist (existence and size in one syscall)."""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+def link_or_copy(source: Path, target: Path) -> None:
+    """
+    Make target a hard link to source (no bytes copied), replacing any existing target.
+    Falls back to a full copy where hard links aren't possible (e.g. across filesystems).
+    
+    The link is made under a temporary name and moved over target, so target is never
+    missing or half-written; if source and target are already the same file, nothing happens.
+    """
+    if target.exists() and os.path.samefile(source, target):
+        return
+    
+    temp_target = target.with_name(f".{target.name}.tmp")
+    temp_target.unlink(missing_ok=True)
+    try:
+        os.link(source, temp_target)
+    except OSError:
+        shutil.copy2(source, temp_target)
+    os.replace(temp_target, target)
+
+
+# Temp cookie files written from YOUTUBE_COOKIES_CONTENT, by content hash. Reused by
+# every download in the process and removed at exit, instead of one leaked file per call.
+_cookie_files: Dict[str, str] = {}
+_cookie_files_lock = threading.Lock()
+
+
+def _remove_cookie_files() -> None:
+    """Delete the temp cookie files written by _get_cookie_file."""
+    for path in _cookie_files.values():
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+atexit.register(_remove_cookie_files)
+
+
+def _get_cookie_file(content: str) -> str:
+    """
+    Path of a temp cookies.txt holding content, written on first use.
+    The file is created readable by the owner only (mkstemp uses mode 0600).
+    """
+    key = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    with _cookie_files_lock:
+        path = _cookie_files.get(key)
+        if path is None or not os.path.exists(path):
+            fd, path = tempfile.mkstemp(suffix='.txt')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            _cookie_files[key] = path
+        return path
+
+
+# Extensions recognised as the downloaded audio, in order of preference
+_DOWNLOADED_AUDIO_SUFFIXES = ('.m4a', '.mp4', '.webm', '.m4v')
+
+
+# Audio extensions the OpenAI transcription API accepts
+_OPENAI_AUDIO_EXTENSIONS = frozenset({'.m4a', '.mp4', '.webm', '.mp3', '.wav', '.flac', '.ogg'})
+
+
+def _sniff_audio_extension(path: Path) -> str:
+    """
+    Extension for an audio file without one, from the container's magic bytes.
+    Defaults to .m4a (what YouTube audio usually is) when the header isn't recognised.
+    """
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(16)
+    except OSError:
+        return '.m4a'
+    
+    if head[4:8] == b'ftyp':  # MP4 family (m4a/mp4)
+        return '.m4a'
+    if head[:4] == b'\x1a\x45\xdf\xa3':  # EBML (WebM/Matroska)
+        return '.webm'
+    if head[:3] == b'ID3' or head[:2] == b'\xff\xfb':
+        return '.mp3'
+    if head[:4] == b'OggS':
+        return '.ogg'
+    if head[:4] == b'fLaC':
+        return '.flac'
+    if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+        return '.wav'
+    return '.m4a'
+
+
+def _find_downloaded_file(output_dir: Path) -> Optional[Path]:
+    """
+    Find the downloaded audio in output_dir with a single directory scan.
+    
+    Returns:
+        First file with a suffix from _DOWNLOADED_AUDIO_SUFFIXES (in that order of
+        preference), else the first file that isn't meta.json, else None
+    """
+    by_suffix = {suffix: None for suffix in _DOWNLOADED_AUDIO_SUFFIXES}
+    other = None
+    try:
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                if entry.name == 'meta.json' or not entry.is_file():
+                    continue
+                suffix = os.path.splitext(entry.name)[1]
+                if suffix in by_suffix:
+                    if by_suffix[suffix] is None:
+                        by_suffix[suffix] = Path(entry.path)
+                elif other is None:
+                    other = Path(entry.path)
+    except FileNotFoundError:
+        return None
+    
+    for path in by_suffix.values():
+        if path is not None:
+            return path
+    return other
+
+
+def _yt_dlp_version() -> str:
+    """yt-dlp's version, for debugging output."""
+    try:
+        from yt_dlp.version import __version__
+        return __version__
+    except ImportError:
+        import yt_dlp
+        return getattr(yt_dlp, '__version__', "unknown")
+
+
+def _find_cached_audio(video_id: str) -> Optional[Tuple[Path, Path]]:
+    """
+    Find a previous download of video_id: a folder named after it (video ID alone, or
+    "<title> - <video ID>") holding meta.json and an audio.<ext> file.
+    
+    Returns:
+        Tuple of (audio_path, meta_path), or None if there is no complete download
+    """
+    title_suffix = f" - {video_id}"
+    try:
+        with os.scandir(Config.OUT_DIR) as folders:
+            candidates = [
+                Path(folder.path) for folder in folders
+                if (folder.name == video_id or folder.name.endswith(title_suffix)) and folder.is_dir()
+            ]
+    except FileNotFoundError:
+        return None
+    
+    for folder in candidates:
+        audio_path = None
+        has_meta = False
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name == 'meta.json':
+                    has_meta = True
+                elif audio_path is None:
+                    stem, suffix = os.path.splitext(entry.name)
+                    if stem == 'audio' and suffix in _OPENAI_AUDIO_EXTENSIONS and entry.is_file():
+                        audio_path = Path(entry.path)
+        if has_meta and audio_path is not None:
+            return audio_path, folder / 'meta.json'
+    return None
+
+
 def get_output_dir(video_id: str, title: Optional[str] = None) -> Path:
     """Get the output directory for a video, named after title with video ID as suffix."""
     if title:
@@ -93,20 +272,26 @@ def download_audio(url: str, force: bool = False) -> Tuple[Path, Dict, str]:
     """
     video_id = extract_video_id(url)
     
-    # We'll get the title during the main download, so start with video_id only
-    # The output_dir will be updated once we have the title
+    # We'll get the title when yt-dlp extracts the video info, so start with video_id only
+    # The output_dir will be updated once we have the title, before anything is downloaded
     output_dir = get_output_dir(video_id, None)
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
     audio_path = output_dir / "audio.mp3"
     meta_path = output_dir / "meta.json"
     
-    # Check cache
-    if not force and audio_path.exists() and meta_path.exists():
-        print(f"✓ Using cached audio for video {video_id}")
-        with open(meta_path, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
-        return audio_path, metadata, video_id
+    # Check cache (downloads end up in the titled folder, as audio.<actual extension>)
+    if not force:
+        cached = _find_cached_audio(video_id)
+        if cached:
+            audio_path, meta_path = cached
+            print(f"✓ Using cached audio for video {video_id}")
+            metadata = orjson.loads(meta_path.read_bytes())
+            return audio_path, metadata, video_id
+    
+    # Only created on a cache miss - cached audio lives in the titled folder
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    # yt-dlp takes a while to import, so a cache hit (above) doesn't load it at all
+    import yt_dlp
     
     # Configure yt-dlp for audio-only download
     # Keep it simple - let yt-dlp use its defaults which are most reliable
@@ -125,6 +310,10 @@ def download_audio(url: str, force: bool = False) -> Tuple[Path, Dict, str]:
         'retries': 10,
         'fragment_retries': 10,
         'file_access_retries': 3,
+        # Download in ranged chunks (avoids YouTube's per-connection throttling)
+        # and fetch fragmented formats over several connections at once
+        'http_chunk_size': HTTP_CHUNK_SIZE,
+        'concurrent_fragment_downloads': CONCURRENT_FRAGMENTS,
     }
     
     # Add cookies if provided (for bypassing YouTube bot detection)
@@ -144,25 +333,21 @@ def download_audio(url: str, force: bool = False) -> Tuple[Path, Dict, str]:
     temp_cookies_file = None
     
     # Log yt-dlp version for debugging
-    print(f"Using yt-dlp version: {YT_DLP_VERSION}")
+    print(f"Using yt-dlp version: {_yt_dlp_version()}")
     
     if cookies_content:
         # Write cookies content to temporary file
         # This is the recommended way for Streamlit Cloud: create a secret named "YOUTUBE_COOKIES_CONTENT"
         # and paste the entire contents of your cookies.txt file
-        import tempfile
         # Strip whitespace and ensure proper formatting
         cookies_content = cookies_content.strip()
         if cookies_content:
-            temp_cookies = tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8')
-            temp_cookies.write(cookies_content)
-            temp_cookies.flush()
-            temp_cookies.close()
-            temp_cookies_file = temp_cookies.name
+            temp_cookies_file = _get_cookie_file(cookies_content)
             ydl_opts['cookiefile'] = temp_cookies_file
             using_cookies = True
             # Verify file was created and has content
-            cookie_file_size = Path(temp_cookies_file).stat().st_size if Path(temp_cookies_file).exists() else 0
+            cookie_stat = _stat_or_none(temp_cookies_file)
+            cookie_file_size = cookie_stat.st_size if cookie_stat else 0
             cookie_lines = len([line for line in cookies_content.split('\n') if line.strip() and not line.strip().startswith('#')])
             if cookie_file_size > 0:
                 print(f"✓ Using YouTube cookies from YOUTUBE_COOKIES_CONTENT (file size: {cookie_file_size} bytes, {cookie_lines} cookie entries)")
@@ -179,12 +364,16 @@ def download_audio(url: str, force: bool = False) -> Tuple[Path, Dict, str]:
         using_cookies = True
         print(f"Using YouTube cookies from: {default_cookies_path}")
     
-    # With cookies, explicitly use web client first (most reliable with cookies)
-    # If that fails, we'll try ios client as fallback
-    if using_cookies:
-        # Web client works best with cookies
+    # With cookies, use web client first (most reliable with cookies)
+    if using_cookies and Config.AGGRESSIVE_RETRY:
+        # Web client only; iOS and Android are retried separately below if it fails
         ydl_opts['extractor_args'] = {'youtube': {'player_client': 'web'}}
         print("Using web client with cookies")
+    elif using_cookies:
+        # yt-dlp falls through the listed clients itself within one extraction,
+        # so a failing client doesn't cost a whole new attempt
+        ydl_opts['extractor_args'] = {'youtube': {'player_client': ['web', 'ios', 'android']}}
+        print("Using web client with cookies (iOS/Android as fallback)")
     else:
         # Without cookies, use android client as it's more reliable for unauthenticated requests
         ydl_opts['extractor_args'] = {'youtube': {'player_client': 'android'}}
@@ -202,10 +391,11 @@ def download_audio(url: str, force: bool = False) -> Tuple[Path, Dict, str]:
     
     # Track downloaded file via progress hook and immediately save it
     saved_file_path = None
+    backup_file_path = None
     
     def progress_hook(d):
         """Hook to save file path when download completes and immediately backup."""
-        nonlocal saved_file_path
+        nonlocal saved_file_path, backup_file_path
         status = d.get('status')
         filename = d.get('filename')
         
@@ -214,211 +404,240 @@ def download_audio(url: str, force: bool = False) -> Tuple[Path, Dict, str]:
                 source_file = Path(filename)
                 if source_file.exists():
                     saved_file_path = source_file
-                    # Immediately copy to our target location to prevent deletion
+                    # Immediately link to a backup name to prevent deletion. The name must
+                    # differ from anything the output template can produce (audio.<ext>),
+                    # and keeps the suffix so the extension is known if the backup is used
+                    backup_file_path = source_file.with_name(f".backup-{source_file.name}")
                     try:
-                        audio_path.parent.mkdir(parents=True, exist_ok=True)
-                        # Always copy, even if target exists (in case of corruption)
-                        shutil.copy2(source_file, audio_path)
+                        link_or_copy(source_file, backup_file_path)
                     except Exception:
-                        # If copy fails, we'll try to rename later
-                        pass
+                        # If that fails, we'll look for the file later
+                        backup_file_path = None
     
     ydl_opts['progress_hooks'] = [progress_hook]
     
+    def extract_and_download(ydl) -> Dict:
+        """
+        Extract the video info, move into the titled folder, then download from that
+        same info (no second extraction), so the folder never needs renaming afterwards.
+        """
+        nonlocal output_dir, audio_path, meta_path
+        probe = ydl.extract_info(url, download=False)
+        title = probe.get('title') if probe else None
+        if title:
+            final_dir = get_output_dir(video_id, title)
+            if final_dir != output_dir:
+                final_dir.mkdir(parents=True, exist_ok=True)
+                try:
+                    # The video ID folder was only needed until the title was known
+                    output_dir.rmdir()
+                except OSError:
+                    pass
+                output_dir = final_dir
+                audio_path = output_dir / "audio.m4a"
+                meta_path = output_dir / "meta.json"
+                ydl.params['outtmpl']['default'] = str(audio_path.with_suffix('.%(ext)s'))
+        return ydl.process_ie_result(probe, download=True)
+    
     # Simple download - let yt-dlp handle retries and fallbacks
-    # Only add fallback player clients if we get specific errors
+    # Separate per-client attempts only with YT2TXT_AGGRESSIVE_RETRY
     info = None
     download_success = False
     last_error = None
     
-    # First attempt: use default yt-dlp behavior (works best with cookies)
+    # Everything after the progress hook fires is covered, so a failure never
+    # leaves the backup link behind
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            print("Downloading audio...")
-            try:
-                info = ydl.extract_info(url, download=True)
-                download_success = True
-            except Exception as download_error:
-                error_str = str(download_error)
-                
-                # If we get 403 or player response error and have cookies, try different clients
-                if ("player response" in error_str.lower() or "403" in error_str or "Forbidden" in error_str) and using_cookies:
-                    import time
-                    print(f"⚠ Got 403/player response error with web client")
-                    print(f"   Error details: {error_str[:300]}")
-                    print(f"   Waiting 2 seconds before trying iOS client...")
-                    time.sleep(2)  # Brief delay to avoid rate limiting
-                    
-                    # Try iOS client (often more reliable with cookies)
-                    fallback_opts = ydl_opts.copy()
-                    fallback_opts['extractor_args'] = {'youtube': {'player_client': 'ios'}}
+        # First attempt: use default yt-dlp behavior (works best with cookies)
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                print("Downloading audio...")
+                try:
+                    info = extract_and_download(ydl)
+                    download_success = True
+                except Exception as download_error:
+                    error_str = str(download_error)
                     
-                    try:
-                        with yt_dlp.YoutubeDL(fallback_opts) as ydl_fallback:
-                            info = ydl_fallback.extract_info(url, download=True)
-                            download_success = True
-                            print("✓ iOS client succeeded!")
-                    except Exception as ios_error:
-                        ios_error_str = str(ios_error)
-                        print(f"⚠ iOS client also failed: {ios_error_str[:300]}")
-                        print(f"   Waiting 2 seconds before trying Android client...")
-                        time.sleep(2)  # Brief delay
+                    # If we get 403 or player response error and have cookies, try different clients
+                    if (
+                        Config.AGGRESSIVE_RETRY and using_cookies
+                        and ("player response" in error_str.lower() or "403" in error_str or "Forbidden" in error_str)
+                    ):
+                        import time
+                        print(f"⚠ Got 403/player response error with web client")
+                        print(f"   Error details: {error_str[:300]}")
+                        print(f"   Waiting 2 seconds before trying iOS client...")
+                        time.sleep(2)  # Brief delay to avoid rate limiting
                         
-                        # Try android client as last resort
-                        print(f"⚠ Trying Android client as last resort...")
-                        fallback_opts2 = ydl_opts.copy()
-                        fallback_opts2['extractor_args'] = {'youtube': {'player_client': 'android'}}
+                        # Try iOS client (often more reliable with cookies)
+                        # The extractor reads extractor_args on each extraction, so the same
+                        # YoutubeDL (extractors, opener, cookie jar) is reused with a new client
+                        ydl.params['extractor_args'] = {'youtube': {'player_client': 'ios'}}
                         
                         try:
-                            with yt_dlp.YoutubeDL(fallback_opts2) as ydl_android:
-                                info = ydl_android.extract_info(url, download=True)
-                                download_success = True
-                                print("✓ Android client succeeded!")
-                        except Exception as android_error:
-                            # If all fail, provide detailed error message
-                            android_error_str = str(android_error)[:300]
-                            print(f"✗ All player clients failed:")
-                            print(f"   Web client: {error_str[:200]}")
-                            print(f"   iOS client: {ios_error_str[:200]}")
-                            print(f"   Android client: {android_error_str[:200]}")
+                            info = extract_and_download(ydl)
+                            download_success = True
+                            print("✓ iOS client succeeded!")
+                        except Exception as ios_error:
+                            ios_error_str = str(ios_error)
+                            print(f"⚠ iOS client also failed: {ios_error_str[:300]}")
+                            print(f"   Waiting 2 seconds before trying Android client...")
+                            time.sleep(2)  # Brief delay
                             
-                            # Determine if this is likely IP blocking vs cookie issue
-                            all_errors = error_str + ios_error_str + android_error_str
-                            is_ip_block = "403" in all_errors or "Forbidden" in all_errors
+                            # Try android client as last resort
+                            print(f"⚠ Trying Android client as last resort...")
+                            ydl.params['extractor_args'] = {'youtube': {'player_client': 'android'}}
                             
-                            if is_ip_block:
-                                # All download methods failed - this is IP blocking from Streamlit Cloud
-                                raise RuntimeError(
-                                    f"All download methods failed with 403/Forbidden errors.\n\n"
-                                    f"This is likely because YouTube is blocking requests from Streamlit Cloud's IP addresses, "
-                                    f"not because your cookies are expired (you just updated them).\n\n"
-                                    f"Your cookies are probably fine - the issue is YouTube's anti-bot measures blocking cloud hosting IPs.\n\n"
-                                    f"Possible solutions:\n"
-                                    f"1. Wait a few minutes and try again (rate limiting)\n"
-                                    f"2. Try a different video URL\n"
-                                    f"3. Run the app locally where it works (your local IP isn't blocked)\n"
-                                    f"4. Consider self-hosting on a VPS with a residential IP\n"
-                                ) from download_error
-                            else:
-                                raise RuntimeError(
-                                    f"All download methods failed. Error details:\n"
-                                    f"Web: {error_str[:150]}\n"
-                                    f"iOS: {ios_error_str[:150]}\n"
-                                    f"Android: {android_error_str[:150]}\n\n"
-                                    f"If you just updated cookies, this might be temporary. Try again in a few minutes."
-                                ) from download_error
-                else:
-                    # For other errors, raise immediately
-                    raise
-    except Exception as e:
-        last_error = e
-        if not download_success:
-            raise RuntimeError(f"Failed to download audio: {str(e)}") from e
-    
-    # Extract metadata and get title for folder renaming
-    metadata = {
-        'url': url,
-        'video_id': video_id,
-        'title': info.get('title') if info else None,
-        'channel': (info.get('uploader') or info.get('channel')) if info else None,
-        'duration': info.get('duration') if info else None,
-        'upload_date': info.get('upload_date') if info else None,
-    }
-    
-    # Rename folder to include title if we have it
-    if metadata.get('title'):
-        new_output_dir = get_output_dir(video_id, metadata['title'])
-        if new_output_dir != output_dir and not new_output_dir.exists():
-            try:
-                output_dir.rename(new_output_dir)
-                output_dir = new_output_dir
-                # Update paths
-                audio_path = output_dir / "audio.m4a"
-                meta_path = output_dir / "meta.json"
-            except Exception:
-                # If rename fails, continue with original directory
-                pass
-    
-    # Ensure audio file has correct extension
-    # yt-dlp downloads without extension, so we need to find and rename it
-    downloaded_file = None  # Will be set from saved_file_path or found files
-    
-    # Also check the file saved via progress hook
-    if not downloaded_file and saved_file_path and saved_file_path.exists():
-        downloaded_file = saved_file_path
-    
-    if not downloaded_file:
-        # Check for file without extension (yt-dlp default behavior)
-        potential_file = output_dir / video_id
-        if potential_file.exists():
-            downloaded_file = potential_file
-        else:
-            # Look for any audio file in the directory
-            audio_files = list(output_dir.glob("*.m4a")) + list(output_dir.glob("*.mp4")) + list(output_dir.glob("*.webm")) + list(output_dir.glob("*.m4v"))
-            if audio_files:
-                downloaded_file = audio_files[0]
-            else:
-                # Last resort: find any file that's not meta.json
-                all_files = [f for f in output_dir.iterdir() if f.is_file() and f.name != 'meta.json'] if output_dir.exists() else []
-                if all_files:
-                    downloaded_file = all_files[0]
-    
-    if downloaded_file and downloaded_file != audio_path:
-        # Make sure the target directory exists
-        audio_path.parent.mkdir(parents=True, exist_ok=True)
+                            try:
+                                info = extract_and_download(ydl)
+                                download_success = True
+                                print("✓ Android client succeeded!")
+                            except Exception as android_error:
+                                # If all fail, provide detailed error message
+                                android_error_str = str(android_error)[:300]
+                                print(f"✗ All player clients failed:")
+                                print(f"   Web client: {error_str[:200]}")
+                                print(f"   iOS client: {ios_error_str[:200]}")
+                                print(f"   Android client: {android_error_str[:200]}")
+                                
+                                # Determine if this is likely IP blocking vs cookie issue
+                                all_errors = error_str + ios_error_str + android_error_str
+                                is_ip_block = "403" in all_errors or "Forbidden" in all_errors
+                                
+                                if is_ip_block:
+                                    # All download methods failed - this is IP blocking from Streamlit Cloud
+                                    raise RuntimeError(
+                                        f"All download methods failed with 403/Forbidden errors.\n\n"
+                                        f"This is likely because YouTube is blocking requests from Streamlit Cloud's IP addresses, "
+                                        f"not because your cookies are expired (you just updated them).\n\n"
+                                        f"Your cookies are probably fine - the issue is YouTube's anti-bot measures blocking cloud hosting IPs.\n\n"
+                                        f"Possible solutions:\n"
+                                        f"1. Wait a few minutes and try again (rate limiting)\n"
+                                        f"2. Try a different video URL\n"
+                                        f"3. Run the app locally where it works (your local IP isn't blocked)\n"
+                                        f"4. Consider self-hosting on a VPS with a residential IP\n"
+                                    ) from download_error
+                                else:
+                                    raise RuntimeError(
+                                        f"All download methods failed. Error details:\n"
+                                        f"Web: {error_str[:150]}\n"
+                                        f"iOS: {ios_error_str[:150]}\n"
+                                        f"Android: {android_error_str[:150]}\n\n"
+                                        f"If you just updated cookies, this might be temporary. Try again in a few minutes."
+                                    ) from download_error
+                    else:
+                        # For other errors, raise immediately
+                        raise
+        except Exception as e:
+            last_error = e
+            if not download_success:
+                raise RuntimeError(f"Failed to download audio: {str(e)}") from e
         
-        # Detect actual file extension
-        actual_extension = downloaded_file.suffix if downloaded_file.suffix else ''
+        # Extract metadata
+        metadata = {
+            'url': url,
+            'video_id': video_id,
+            'title': info.get('title') if info else None,
+            'channel': (info.get('uploader') or info.get('channel')) if info else None,
+            'duration': info.get('duration') if info else None,
+            'upload_date': info.get('upload_date') if info else None,
+        }
         
-        # If no extension, try to detect from file content
-        if not actual_extension:
-            import mimetypes
-            mime_type, _ = mimetypes.guess_type(str(downloaded_file))
-            if mime_type:
-                ext_map = {
-                    'audio/mp4': '.m4a',
-                    'video/mp4': '.mp4',
-                    'audio/webm': '.webm',
-                    'video/webm': '.webm',
-                }
-                actual_extension = ext_map.get(mime_type, '.m4a')
-            else:
-                actual_extension = '.m4a'  # Default fallback
+        # Ensure audio file has correct extension
+        # yt-dlp downloads without extension, so we need to find and rename it
+        downloaded_file = None  # Will be set from saved_file_path, the info dict or found files
         
-        # Ensure extension is OpenAI-compatible
-        if actual_extension not in ['.m4a', '.mp4', '.webm', '.mp3', '.wav', '.flac', '.ogg']:
-            actual_extension = '.m4a'  # Force to m4a if unsupported
+        # The file saved via progress hook is right in almost every case
+        if saved_file_path and saved_file_path.exists():
+            downloaded_file = saved_file_path
+        elif backup_file_path and backup_file_path.exists():
+            # yt-dlp deleted the original after the hook ran; use the backup link
+            downloaded_file = backup_file_path
         
-        final_audio_path = audio_path.parent / f"audio{actual_extension}"
+        # Otherwise yt-dlp records where it wrote the file in the info dict
+        if not downloaded_file and info and info.get('requested_downloads'):
+            filepath = info['requested_downloads'][0].get('filepath')
+            if filepath and os.path.isfile(filepath):
+                downloaded_file = Path(filepath)
         
-        downloaded_file.rename(final_audio_path)
-        audio_path = final_audio_path  # Update audio_path to reflect actual file
-        print(f"✓ Audio file saved as: {audio_path.name}")
-    elif not audio_path.exists():
-        # Check if file exists with different extension
-        for ext in ['.m4a', '.mp4', '.webm', '.mp3']:
-            potential_path = audio_path.parent / f"audio{ext}"
-            if potential_path.exists():
-                audio_path = potential_path
-                print(f"✓ Found audio file: {audio_path.name}")
-                break
-        else:
-            # If we still don't have the file, that's a real problem
-            raise RuntimeError("Audio file was not downloaded successfully")
+        # Only scan the folder if neither says where the file is
+        if not downloaded_file:
+            # Check for file without extension (yt-dlp default behavior)
+            potential_file = output_dir / video_id
+            if potential_file.exists():
+                downloaded_file = potential_file
+            else:
+                # Look for any audio file in the directory, else any file that's not meta.json
+                downloaded_file = _find_downloaded_file(output_dir)
+        
+        if downloaded_file and downloaded_file != audio_path:
+            # Make sure the target directory exists
+            audio_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            # Detect actual file extension
+            actual_extension = downloaded_file.suffix if downloaded_file.suffix else ''
+            
+            # If no extension, detect it from the file content (a guess from the
+            # name alone has nothing to go on)
+            if not actual_extension:
+                actual_extension = _sniff_audio_extension(downloaded_file)
+            
+            # Ensure extension is OpenAI-compatible
+            if actual_extension not in _OPENAI_AUDIO_EXTENSIONS:
+                actual_extension = '.m4a'  # Force to m4a if unsupported
+            
+            final_audio_path = audio_path.parent / f"audio{actual_extension}"
+            
+            downloaded_file.rename(final_audio_path)
+            audio_path = final_audio_path  # Update audio_path to reflect actual file
+            print(f"✓ Audio file saved as: {audio_path.name}")
+        elif not audio_path.exists():
+            # Check if file exists with different extension
+            for ext in ['.m4a', '.mp4', '.webm', '.mp3']:
+                potential_path = audio_path.parent / f"audio{ext}"
+                if potential_path.exists():
+                    audio_path = potential_path
+                    print(f"✓ Found audio file: {audio_path.name}")
+                    break
+            else:
+                # If we still don't have the file, that's a real problem
+                raise RuntimeError("Audio file was not downloaded successfully")
+    finally:
+        # The backup link is no longer needed once the audio has its final name
+        # (or the download failed)
+        if backup_file_path and backup_file_path != audio_path:
+            backup_file_path.unlink(missing_ok=True)
     
-    # Save metadata
-    with open(meta_path, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    # Save metadata (orjson writes UTF-8 bytes directly, non-ASCII kept as-is)
+    meta_path.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
     
     print(f"✓ Audio downloaded: {audio_path}")
     
-    # Clean up temp cookies file if we created one
-    if temp_cookies_file and Path(temp_cookies_file).exists():
-        try:
-            os.unlink(temp_cookies_file)
-        except:
-            pass  # Ignore cleanup errors
-    
     return audio_path, metadata, video_id
 
 
+def download_audio_batch(
+    urls: List[str],
+    force: bool = False,
+    max_workers: int = BATCH_DOWNLOAD_WORKERS
+) -> Dict[str, Tuple[Path, Dict, str]]:
+    """
+    Download audio for several YouTube URLs concurrently.
+    
+    Downloads are network-bound, so they overlap on threads; each one runs
+    download_audio with its own YoutubeDL instance.
+    
+    Args:
+        urls: YouTube video URLs
+        force: If True, re-download even if cached
+        max_workers: Maximum downloads in flight at once
+        
+    Returns:
+        Dict of url -> (audio_path, metadata_dict, video_id)
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(download_audio, url, force): url for url in urls}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
@@ -2,10 +2,10 @@
 
 import time
 from pathlib import Path
-from openai import OpenAI
 from openai import APIError, RateLimitError, APIConnectionError
 from tqdm import tqdm
 
+from yt2txt.client import get_openai_client
 from yt2txt.config import Config
 from yt2txt.models import Transcript
 from yt2txt.analyzer import get_transcript_text
@@ -57,11 +57,8 @@ def format_transcript(
     # Validate API key
     Config.validate()
     
-    # Initialize OpenAI client
-    client = OpenAI(
-        api_key=Config.OPENAI_API_KEY,
-        timeout=300.0  # 5 minute timeout
-    )
+    # Shared OpenAI client (reuses its connection pool across calls), 5 minute timeout
+    client = get_openai_client().with_options(timeout=300.0)
     
     # Get transcript text
     transcript_text = get_transcript_text(transcript)
@@ -72,107 +69,74 @@ def format_transcript(
     # Get analysis model from config (use same model as analysis)
     model = Config.ANALYSIS_MODEL
     
-    # Analyze with retries
+    # Prepare request parameters (the same for every attempt)
+    request_params = {
+        "model": model,
+        "messages": [
+            {
+                "role": "user",
+                "content": user_message
+            }
+        ],
+        "temperature": 0.3  # Low temperature for faithful formatting
+    }
+    
+    # Format with retries
+    # One elapsed-time indicator for all attempts (the API gives no progress, so nothing polls
+    # while waiting); messages go through pbar.write so they don't break the bar's line
+    print("Formatting transcript with GPT...")
     last_error = None
-    for attempt in range(Config.MAX_RETRIES + 1):
-        try:
-            if attempt > 0:
-                print(f"Formatting transcript (attempt {attempt + 1}/{Config.MAX_RETRIES + 1})...")
-            else:
-                print("Formatting transcript with GPT...")
-            
-            # Create progress bar
-            with tqdm(
-                total=100,
-                desc="Formatting",
-                unit="%",
-                bar_format="{desc}: {percentage:3.0f}%|{bar}| {elapsed}",
-                ncols=80,
-                leave=False
-            ) as pbar:
-                # Simulate progress
-                progress_complete = False
+    with tqdm(total=None, desc="Formatting", bar_format="{desc} {elapsed}", leave=False) as pbar:
+        for attempt in range(Config.MAX_RETRIES + 1):
+            try:
+                if attempt > 0:
+                    pbar.write(f"Formatting transcript (attempt {attempt + 1}/{Config.MAX_RETRIES + 1})...")
+                    pbar.reset()
+                
+                response = client.chat.completions.create(**request_params)
+                
+                # Extract formatted text
+                formatted_text = response.choices[0].message.content
                 
-                def update_progress():
-                    """Simulate progress since API doesn't provide real-time updates."""
-                    nonlocal progress_complete
-                    current = 0
-                    while not progress_complete and current < 95:
-                        time.sleep(0.2)
-                        current = min(current + 2, 95)
-                        pbar.n = int(current)
-                        pbar.refresh()
+                # Save to file
+                with open(formatted_path, 'w', encoding='utf-8') as f:
+                    f.write(formatted_text)
                 
-                import threading
-                progress_thread = threading.Thread(target=update_progress, daemon=True)
-                progress_thread.start()
+                pbar.write("✓ Formatting complete")
+                return formatted_text
                 
-                try:
-                    # Prepare request parameters
-                    request_params = {
-                        "model": model,
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": user_message
-                            }
-                        ],
-                        "temperature": 0.3  # Low temperature for faithful formatting
-                    }
+            except RateLimitError as e:
+                last_error = e
+                if attempt < Config.MAX_RETRIES:
+                    wait_time = 2 ** attempt
+                    pbar.write(f"Rate limit hit. Waiting {wait_time} seconds before retry...")
+                    time.sleep(wait_time)
+                    continue
+                else:
+                    raise RuntimeError(f"Rate limit exceeded: {e}") from e
                     
-                    response = client.chat.completions.create(**request_params)
+            except APIConnectionError as e:
+                last_error = e
+                if attempt < Config.MAX_RETRIES:
+                    wait_time = 2 ** attempt
+                    pbar.write(f"Connection error. Waiting {wait_time} seconds before retry...")
+                    time.sleep(wait_time)
+                    continue
+                else:
+                    raise RuntimeError(f"Connection error: {e}") from e
                     
-                    progress_complete = True
-                    pbar.n = 100
-                    pbar.refresh()
-                    progress_thread.join(timeout=0.5)
-                except Exception as e:
-                    progress_complete = True
-                    progress_thread.join(timeout=0.5)
-                    raise
-            
-            # Extract formatted text
-            formatted_text = response.choices[0].message.content
-            
-            # Save to file
-            with open(formatted_path, 'w', encoding='utf-8') as f:
-                f.write(formatted_text)
-            
-            print(f"✓ Formatting complete")
-            return formatted_text
-            
-        except RateLimitError as e:
-            last_error = e
-            if attempt < Config.MAX_RETRIES:
-                wait_time = 2 ** attempt
-                print(f"Rate limit hit. Waiting {wait_time} seconds before retry...")
-                time.sleep(wait_time)
-                continue
-            else:
-                raise RuntimeError(f"Rate limit exceeded: {e}") from e
+            except APIError as e:
+                # Handle server errors (5xx) with retry
+                is_5xx_error = hasattr(e, 'status_code') and e.status_code and 500 <= e.status_code < 600
+                if is_5xx_error and attempt < Config.MAX_RETRIES:
+                    wait_time = 2 ** attempt
+                    pbar.write(f"Server error. Waiting {wait_time} seconds before retry...")
+                    time.sleep(wait_time)
+                    continue
                 
-        except APIConnectionError as e:
-            last_error = e
-            if attempt < Config.MAX_RETRIES:
-                wait_time = 2 ** attempt
-                print(f"Connection error. Waiting {wait_time} seconds before retry...")
-                time.sleep(wait_time)
-                continue
-            else:
-                raise RuntimeError(f"Connection error: {e}") from e
+                raise RuntimeError(f"OpenAI API error: {e}") from e
                 
-        except APIError as e:
-            # Handle server errors (5xx) with retry
-            is_5xx_error = hasattr(e, 'status_code') and e.status_code and 500 <= e.status_code < 600
-            if is_5xx_error and attempt < Config.MAX_RETRIES:
-                wait_time = 2 ** attempt
-                print(f"Server error. Waiting {wait_time} seconds before retry...")
-                time.sleep(wait_time)
-                continue
-            
-            raise RuntimeError(f"OpenAI API error: {e}") from e
-            
-        except Exception as e:
-            raise RuntimeError(f"Unexpected error during formatting: {str(e)}") from e
-    
+            except Exception as e:
+                raise RuntimeError(f"Unexpected error during formatting: {str(e)}") from e
+        
     raise RuntimeError(f"Failed to format after {Config.MAX_RETRIES + 1} attempts") from last_error
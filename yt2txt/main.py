@@ -1,6 +1,8 @@
 """Interactive main entry point for YouTube transcription."""
 
 import sys
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from yt2txt.config import Config
 from yt2txt.downloader import download_audio, get_output_dir
@@ -9,9 +11,7 @@ from yt2txt.transcriber import transcribe_audio
 from yt2txt.analyzer import analyze_transcript
 from yt2txt.chat import start_chat_session
 from yt2txt.slide_extractor import SlideExtractor
-from yt2txt.writers.txt_writer import write_txt
-from yt2txt.writers.json_writer import write_json
-from yt2txt.writers.srt_writer import write_srt
+from yt2txt.writers.transcript_files import write_transcript_files
 from yt2txt.writers.analysis_writer import write_analysis
 
 
@@ -28,49 +28,38 @@ def process_video(url: str, force: bool = False, extract_slides: bool = False, a
     Returns:
         Tuple of (output_dir, transcript, analysis_text)
     """
+    # Network-bound stages (video download, GPT analysis) run here while the
+    # main thread transcribes and extracts slides
+    pipeline = ThreadPoolExecutor(max_workers=2)
     try:
         # Download audio
         audio_path, metadata, video_id = download_audio(url, force=force)
         output_dir = audio_path.parent
         
+        # Start the video download now so it overlaps with transcription
+        video_future = pipeline.submit(download_video, url, force) if extract_slides else None
+        
         # Transcribe
         transcript = transcribe_audio(audio_path, video_id, url, metadata, force=force)
         
-        # Write outputs
+        # Write outputs (independent file I/O, so the three writes overlap on threads)
         print("Writing transcript files...")
-        write_json(transcript, output_dir / "transcript.json")
-        write_txt(transcript, output_dir / "transcript_with_timestamps.txt")
-        write_srt(transcript, output_dir / "transcript.srt")
+        write_transcript_files(transcript, output_dir)
         
-        # Analyze transcript if requested
-        analysis_text = None
+        # Analyze transcript if requested (runs alongside slide extraction)
+        analysis_future = None
         if analyze:
             print()
             print("Analyzing transcript with GPT...")
-            try:
-                analysis_text = analyze_transcript(transcript, output_dir, force=force)
-                write_analysis(analysis_text, output_dir / "equity_analysis.txt")
-                print(f"✓ Equity analysis saved to: equity_analysis.txt")
-                
-                # Show the analysis
-                print()
-                print("=" * 60)
-                print("EQUITY ANALYSIS")
-                print("=" * 60)
-                print(analysis_text)
-                print("=" * 60)
-                
-            except Exception as e:
-                print(f"⚠ Error analyzing transcript: {str(e)}")
-                print("Continuing without analysis...")
+            analysis_future = pipeline.submit(analyze_transcript, transcript, output_dir, force)
         
         # Extract slides if requested
         if extract_slides:
             print()
             print("Extracting slides from video...")
             try:
-                # Download video (not just audio)
-                video_path, _, _ = download_video(url, force=force)
+                # Video (not just audio) was downloaded in the background during transcription
+                video_path, _, _ = video_future.result()
                 
                 # Extract slides (images only, no OCR)
                 extractor = SlideExtractor()
@@ -79,7 +68,6 @@ def process_video(url: str, force: bool = False, extract_slides: bool = False, a
                 
                 if slides:
                     # Create a manifest file listing all slides with timestamps
-                    import json
                     slides_manifest = [
                         {
                             'timestamp': timestamp,
@@ -88,9 +76,9 @@ def process_video(url: str, force: bool = False, extract_slides: bool = False, a
                         }
                         for timestamp, slide_path in slides
                     ]
+                    # Compact JSON in a single write (slides_viewer.html is the human-readable view)
                     manifest_path = output_dir / "slides_manifest.json"
-                    with open(manifest_path, 'w', encoding='utf-8') as f:
-                        json.dump(slides_manifest, f, indent=2)
+                    manifest_path.write_bytes(orjson.dumps(slides_manifest))
                     
                     # Create an HTML file for easy viewing
                     html_content = """<!DOCTYPE html>
@@ -171,12 +159,34 @@ def process_video(url: str, force: bool = False, extract_slides: bool = False, a
                 print(f"⚠ Error extracting slides: {str(e)}")
                 print("Continuing without slide extraction...")
         
+        analysis_text = None
+        if analysis_future is not None:
+            try:
+                analysis_text = analysis_future.result()
+                write_analysis(analysis_text, output_dir / "equity_analysis.txt")
+                print(f"✓ Equity analysis saved to: equity_analysis.txt")
+                
+                # Show the analysis
+                print()
+                print("=" * 60)
+                print("EQUITY ANALYSIS")
+                print("=" * 60)
+                print(analysis_text)
+                print("=" * 60)
+                
+            except Exception as e:
+                print(f"⚠ Error analyzing transcript: {str(e)}")
+                print("Continuing without analysis...")
+        
         print(f"✓ All files saved successfully!")
         return output_dir, transcript, analysis_text
         
     except Exception as e:
         print(f"\n✗ Error processing video: {str(e)}", file=sys.stderr)
         raise
+    finally:
+        # Don't start queued work after a failure; a running download can't be interrupted
+        pipeline.shutdown(wait=False, cancel_futures=True)
 
 
 def main():
@@ -1,12 +1,30 @@
 """Data models for transcripts and segments."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from operator import itemgetter
 from typing import Optional
 
 
-@dataclass
+def minutes_label(seconds: float) -> str:
+    """Format seconds as a "[MM:SS]" display label."""
+    minutes, secs = divmod(int(seconds), 60)
+    return f"[{minutes:02d}:{secs:02d}]"
+
+
+# Rough characters per token, for estimates that don't need a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Reads (start, end, text) from a serialized segment dict in one call,
+# in Segment's positional field order
+SEGMENT_FIELDS = itemgetter('start', 'end', 'text')
+
+
+@dataclass(slots=True)
 class Segment:
-    """A single segment of transcribed text with timing information."""
+    """
+    A single segment of transcribed text with timing information.
+    Uses __slots__ since long transcripts hold thousands of these.
+    """
     start: float  # Start time in seconds
     end: float    # End time in seconds
     text: str     # Transcribed text
@@ -22,9 +40,35 @@ class Transcript:
     duration: Optional[int] = None  # Duration in seconds
     language: Optional[str] = None
     segments: list[Segment] = None
+    _timestamp_labels: Optional[list[str]] = field(default=None, init=False, repr=False, compare=False)
+    _full_text: Optional[tuple[int, str]] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Initialize segments list if not provided."""
         if self.segments is None:
             self.segments = []
-
+    
+    @property
+    def full_text(self) -> str:
+        """
+        Segment texts joined with newlines (the text sent to GPT).
+        Built on first access and kept on the transcript, keyed on the segment count
+        so segments added while transcribing are picked up.
+        """
+        if self._full_text is None or self._full_text[0] != len(self.segments):
+            self._full_text = (len(self.segments), "\n".join(segment.text for segment in self.segments))
+        return self._full_text[1]
+    
+    @property
+    def approx_tokens(self) -> int:
+        """Approximate token count of full_text (characters / CHARS_PER_TOKEN)."""
+        return len(self.full_text) // CHARS_PER_TOKEN + 1
+    
+    def timestamp_labels(self) -> list[str]:
+        """
+        "[MM:SS]" start label for each segment.
+        Built on first use and kept on the transcript, so display code doesn't reformat them.
+        """
+        if self._timestamp_labels is None or len(self._timestamp_labels) != len(self.segments):
+            self._timestamp_labels = [minutes_label(segment.start) for segment in self.segments]
+        return self._timestamp_labels
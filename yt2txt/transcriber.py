@@ -1,14 +1,22 @@
 """OpenAI Whisper API integration for transcription."""
 
-import json
 import time
+import orjson
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from openai import OpenAI
 from openai import APIError, RateLimitError, APIConnectionError
 
+from yt2txt.client import api_error, get_openai_client, is_html_error
 from yt2txt.config import Config
-from yt2txt.models import Segment, Transcript
+from yt2txt.models import SEGMENT_FIELDS, Segment, Transcript
+
+# Chunk length used when splitting files over the 25 MB upload limit
+CHUNK_DURATION_MINUTES = 10
+
+# Maximum number of chunks sent to the API at once
+MAX_PARALLEL_CHUNKS = 8
 
 
 def _chunk_audio_file(audio_path: Path, max_chunk_duration_minutes: int = 10) -> list[Path]:
@@ -25,7 +33,6 @@ def _chunk_audio_file(audio_path: Path, max_chunk_duration_minutes: int = 10) ->
     """
     try:
         import subprocess
-        import json
         
         print(f"  Analyzing audio file...")
         
@@ -39,7 +46,7 @@ def _chunk_audio_file(audio_path: Path, max_chunk_duration_minutes: int = 10) ->
         ]
         
         result = subprocess.run(probe_cmd, capture_output=True, text=True, check=True)
-        probe_data = json.loads(result.stdout)
+        probe_data = orjson.loads(result.stdout)
         total_duration = float(probe_data['format']['duration'])
         
         # Calculate number of chunks needed
@@ -92,13 +99,131 @@ def _chunk_audio_file(audio_path: Path, max_chunk_duration_minutes: int = 10) ->
         ) from e
 
 
+def _seg_value(seg, key: str, default: float) -> float:
+    """Read a numeric field from a segment returned as a dict or an object."""
+    return float(seg.get(key, default) if isinstance(seg, dict) else getattr(seg, key, default))
+
+
+def _transcribe_chunk(
+    client: OpenAI,
+    chunk_path: Path,
+    chunk_num: int,
+    total_chunks: int,
+    metadata: dict
+) -> tuple[list, Optional[str]]:
+    """
+    Transcribe a single audio chunk with retries.
+    
+    Args:
+        client: OpenAI client
+        chunk_path: Path to the chunk audio file
+        chunk_num: 1-based chunk index (for logging)
+        total_chunks: Total number of chunks (for logging)
+        metadata: Video metadata dictionary
+        
+    Returns:
+        Tuple of (segments_data, detected_language)
+    """
+    last_error = None
+    for attempt in range(Config.MAX_RETRIES + 1):
+        try:
+            if attempt > 0:
+                print(f"  Attempt {attempt + 1}/{Config.MAX_RETRIES + 1}...")
+            
+            # Show file size info
+            chunk_size_mb = chunk_path.stat().st_size / (1024 * 1024)
+            print(f"  File size: {chunk_size_mb:.1f} MB")
+            
+            # Transcribe this chunk
+            with open(chunk_path, 'rb') as audio_file:
+                response = client.audio.transcriptions.create(
+                    model=Config.MODEL,
+                    file=audio_file,
+                    response_format="verbose_json",
+                    language=None,  # Auto-detect
+                )
+            
+            # Parse response
+            if hasattr(response, 'model_dump'):
+                response_dict = response.model_dump()
+            elif hasattr(response, 'dict'):
+                response_dict = response.dict()
+            elif isinstance(response, dict):
+                response_dict = response
+            else:
+                response_dict = {
+                    'text': getattr(response, 'text', ''),
+                    'language': getattr(response, 'language', None),
+                    'duration': getattr(response, 'duration', None),
+                    'segments': getattr(response, 'segments', [])
+                }
+            
+            # Extract segments
+            segments_data = response_dict.get('segments', [])
+            
+            # If no segments but we have text, create a single segment
+            if not segments_data and response_dict.get('text'):
+                duration = response_dict.get('duration') or metadata.get('duration', 0)
+                segments_data = [{
+                    'start': 0.0,
+                    'end': float(duration) if duration else 0.0,
+                    'text': response_dict.get('text', '')
+                }]
+            
+            print(f"  ✓ Chunk {chunk_num} complete: {len(segments_data)} segments")
+            return segments_data, response_dict.get('language')
+        
+        except RateLimitError as e:
+            last_error = e
+            if attempt < Config.MAX_RETRIES:
+                wait_time = 2 ** attempt
+                print(f"  Rate limit hit. Waiting {wait_time} seconds...")
+                time.sleep(wait_time)
+                continue
+            else:
+                raise api_error(e) from e
+        
+        except APIConnectionError as e:
+            last_error = e
+            if attempt < Config.MAX_RETRIES:
+                wait_time = 2 ** attempt
+                print(f"  Connection error. Waiting {wait_time} seconds...")
+                time.sleep(wait_time)
+                continue
+            else:
+                raise api_error(e) from e
+        
+        except APIError as e:
+            # Check if it's an HTML response (502/503 gateway errors)
+            is_html = is_html_error(str(e))
+            is_5xx_error = hasattr(e, 'status_code') and e.status_code and 500 <= e.status_code < 600
+            
+            # Retry on 5xx server errors (including 502 Bad Gateway)
+            if (is_html or is_5xx_error) and attempt < Config.MAX_RETRIES:
+                last_error = e
+                wait_time = 2 ** attempt
+                if is_html:
+                    print(f"Server error (502 Bad Gateway). Waiting {wait_time} seconds before retry...")
+                else:
+                    print(f"Server error ({getattr(e, 'status_code', '5xx')}). Waiting {wait_time} seconds before retry...")
+                time.sleep(wait_time)
+                continue
+            
+            raise api_error(e) from e
+        
+        except Exception as e:
+            raise RuntimeError(f"Unexpected error during transcription: {str(e)}") from e
+    
+    raise RuntimeError(f"Failed to transcribe chunk {chunk_num}/{total_chunks}") from last_error
+
 
 def transcribe_audio(
     audio_path: Path,
     video_id: str,
     url: str,
     metadata: dict,
-    force: bool = False
+    force: bool = False,
+    on_chunk_complete: Optional[Callable[[int, int, list[Segment]], None]] = None
 ) -> Transcript:
     """
     Transcribe audio using OpenAI Whisper API.
@@ -109,6 +234,8 @@ def transcribe_audio(
         url: YouTube video URL
         metadata: Video metadata dictionary
         force: If True, re-transcribe even if cached
+        on_chunk_complete: Optional callback(chunk_num, total_chunks, segments),
+            called from the transcribing thread as each chunk finishes
         
     Returns:
         Transcript object with segments
@@ -119,13 +246,10 @@ def transcribe_audio(
     # Check cache
     if not force and transcript_path.exists():
         print(f"✓ Using cached transcript for video {video_id}")
-        with open(transcript_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = orjson.loads(transcript_path.read_bytes())
         
-        segments = [
-            Segment(start=s['start'], end=s['end'], text=s['text'])
-            for s in data.get('segments', [])
-        ]
+        # One itemgetter call per segment instead of three dict lookups
+        segments = [Segment(*SEGMENT_FIELDS(s)) for s in data.get('segments', [])]
         
         return Transcript(
             video_id=data.get('video_id', video_id),
@@ -158,7 +282,7 @@ def transcribe_audio(
         print(f"⚠ File size ({file_size_mb:.1f} MB) exceeds OpenAI's 25 MB limit.")
         print(f"  Splitting into chunks using pydub...")
         try:
-            chunk_paths = _chunk_audio_file(audio_path, max_chunk_duration_minutes=10)
+            chunk_paths = _chunk_audio_file(audio_path, max_chunk_duration_minutes=CHUNK_DURATION_MINUTES)
             print(f"  ✓ Split into {len(chunk_paths)} chunks")
         except Exception as e:
             raise RuntimeError(
@@ -172,153 +296,59 @@ def transcribe_audio(
     timeout_seconds = 300.0 + (file_size_mb / 10) * 60.0
     timeout_seconds = min(timeout_seconds, 1800.0)  # Cap at 30 minutes
     
-    # Initialize OpenAI client with dynamic timeout
-    client = OpenAI(
-        api_key=Config.OPENAI_API_KEY,
-        timeout=timeout_seconds
-    )
+    # Use the shared OpenAI client (reuses warm connections) with a dynamic timeout
+    client = get_openai_client().with_options(timeout=timeout_seconds)
     
-    # STEP 3: Transcribe each chunk
-    all_segments = []
-    detected_language = None
+    # STEP 3: Transcribe chunks in parallel (API calls are I/O bound, so threads suffice)
+    total_chunks = len(chunk_paths)
+    if total_chunks > 1:
+        print(f"Transcribing {total_chunks} chunks in parallel...")
+    else:
+        print("Transcribing audio...")
     
-    for chunk_idx, chunk_path in enumerate(chunk_paths):
-        chunk_num = chunk_idx + 1
-        total_chunks = len(chunk_paths)
-        
-        if total_chunks > 1:
-            print(f"Transcribing chunk {chunk_num}/{total_chunks}...")
-        else:
-            print("Transcribing audio...")
+    chunk_duration_seconds = CHUNK_DURATION_MINUTES * 60
+    chunk_segments: list[list[Segment]] = [[] for _ in chunk_paths]
+    chunk_languages: list[Optional[str]] = [None] * total_chunks
+    
+    max_workers = min(MAX_PARALLEL_CHUNKS, total_chunks)
+    # Not a with-block: its exit would wait for every chunk still running after one fails
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {
+            executor.submit(_transcribe_chunk, client, chunk_path, chunk_idx + 1, total_chunks, metadata): chunk_idx
+            for chunk_idx, chunk_path in enumerate(chunk_paths)
+        }
         
-        # Transcribe with retries
-        last_error = None
-        for attempt in range(Config.MAX_RETRIES + 1):
-            try:
-                if attempt > 0:
-                    print(f"  Attempt {attempt + 1}/{Config.MAX_RETRIES + 1}...")
-                
-                # Show file size info
-                chunk_size_mb = chunk_path.stat().st_size / (1024 * 1024)
-                print(f"  File size: {chunk_size_mb:.1f} MB")
-                
-                # Transcribe this chunk
-                with open(chunk_path, 'rb') as audio_file:
-                    response = client.audio.transcriptions.create(
-                        model=Config.MODEL,
-                        file=audio_file,
-                        response_format="verbose_json",
-                        language=None,  # Auto-detect
-                    )
-                
-                # Parse response
-                if hasattr(response, 'model_dump'):
-                    response_dict = response.model_dump()
-                elif hasattr(response, 'dict'):
-                    response_dict = response.dict()
-                elif isinstance(response, dict):
-                    response_dict = response
-                else:
-                    response_dict = {
-                        'text': getattr(response, 'text', ''),
-                        'language': getattr(response, 'language', None),
-                        'duration': getattr(response, 'duration', None),
-                        'segments': getattr(response, 'segments', [])
-                    }
-                
-                # Extract segments
-                segments_data = response_dict.get('segments', [])
-                if not detected_language:
-                    detected_language = response_dict.get('language')
-                
-                # If no segments but we have text, create a single segment
-                if not segments_data and response_dict.get('text'):
-                    duration = response_dict.get('duration') or metadata.get('duration', 0)
-                    segments_data = [{
-                        'start': 0.0,
-                        'end': float(duration) if duration else 0.0,
-                        'text': response_dict.get('text', '')
-                    }]
-                
-                # Add segments from this chunk
-                for seg in segments_data:
-                    all_segments.append(seg)
-                
-                print(f"  ✓ Chunk {chunk_num} complete: {len(segments_data)} segments")
-                break  # Success, exit retry loop
-                
-            except RateLimitError as e:
-                last_error = e
-                if attempt < Config.MAX_RETRIES:
-                    wait_time = 2 ** attempt
-                    print(f"  Rate limit hit. Waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    raise RuntimeError(
-                        f"Rate limit exceeded after {Config.MAX_RETRIES + 1} attempts."
-                    ) from e
-                    
-            except APIConnectionError as e:
-                last_error = e
-                if attempt < Config.MAX_RETRIES:
-                    wait_time = 2 ** attempt
-                    print(f"  Connection error. Waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    raise RuntimeError(
-                        f"Connection error after {Config.MAX_RETRIES + 1} attempts: {str(e)}"
-                    ) from e
-                    
-            except APIError as e:
-                error_msg = str(e)
-                
-                # Check if it's an HTML response (502/503 gateway errors)
-                is_html_error = "<!DOCTYPE html>" in error_msg or "<html" in error_msg.lower()
-                is_5xx_error = hasattr(e, 'status_code') and e.status_code and 500 <= e.status_code < 600
-                
-                # Retry on 5xx server errors (including 502 Bad Gateway)
-                if (is_html_error or is_5xx_error) and attempt < Config.MAX_RETRIES:
-                    last_error = e
-                    wait_time = 2 ** attempt
-                    if is_html_error:
-                        print(f"Server error (502 Bad Gateway). Waiting {wait_time} seconds before retry...")
-                    else:
-                        print(f"Server error ({getattr(e, 'status_code', '5xx')}). Waiting {wait_time} seconds before retry...")
-                    time.sleep(wait_time)
-                    continue
-                
-                # Non-retryable API errors
-                if "quota" in error_msg.lower() or "billing" in error_msg.lower():
-                    raise RuntimeError(
-                        f"OpenAI API quota/billing error: {error_msg}. "
-                        f"Please check your OpenAI account."
-                    ) from e
-                
-                # Clean up HTML error messages
-                if is_html_error:
-                    raise RuntimeError(
-                        "OpenAI API server error (502 Bad Gateway). "
-                        "This is a temporary issue on OpenAI's servers. Please try again in a few minutes."
-                    ) from e
-                
-                raise RuntimeError(f"OpenAI API error: {error_msg}") from e
-                
-            except Exception as e:
-                raise RuntimeError(f"Unexpected error during transcription: {str(e)}") from e
-
+        # Handle chunks as they finish so callers can show partial results
+        for future in as_completed(futures):
+            chunk_idx = futures[future]
+            segments_data, language = future.result()
+            
+            # Offset each chunk's timestamps by its start time in the full audio
+            offset = chunk_idx * chunk_duration_seconds if total_chunks > 1 else 0.0
+            chunk_segments[chunk_idx] = [
+                Segment(
+                    start=_seg_value(seg, 'start', 0) + offset,
+                    end=_seg_value(seg, 'end', 0) + offset,
+                    text=(seg.get('text', '') if isinstance(seg, dict) else getattr(seg, 'text', '')).strip()
+                )
+                for seg in segments_data
+            ]
+            chunk_languages[chunk_idx] = language
+            
+            if on_chunk_complete:
+                on_chunk_complete(chunk_idx + 1, total_chunks, chunk_segments[chunk_idx])
+    except BaseException:
+        # Stop paying for chunks whose results would be thrown away: queued ones are
+        # cancelled, and the ones already running finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
     
-    # STEP 4: Process all segments (no timestamp correction needed since SPEED_FACTOR = 1.0)
-    print(f"Processing {len(all_segments)} total segments...")
-    segments = [
-        Segment(
-            start=float(seg.get('start', 0) if isinstance(seg, dict) else getattr(seg, 'start', 0)),
-            end=float(seg.get('end', 0) if isinstance(seg, dict) else getattr(seg, 'end', 0)),
-            text=(seg.get('text', '') if isinstance(seg, dict) else getattr(seg, 'text', '')).strip()
-        )
-        for seg in all_segments
-    ]
+    # STEP 4: Reassemble segments in chunk order (no timestamp correction needed since SPEED_FACTOR = 1.0)
+    segments = [segment for chunk in chunk_segments for segment in chunk]
+    detected_language = next((language for language in chunk_languages if language), None)
+    print(f"Processing {len(segments)} total segments...")
     
     transcript = Transcript(
         video_id=video_id,
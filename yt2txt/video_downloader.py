@@ -1,11 +1,32 @@
 """Download video file (not just audio) for slide extraction."""
 
-import shutil
+import os
+import orjson
 from pathlib import Path
 from typing import Dict, Tuple
 import yt_dlp
+from yt_dlp.utils import DownloadError, PostProcessingError
 from yt2txt.config import Config
-from yt2txt.downloader import extract_video_id, get_output_dir
+from yt2txt.downloader import extract_video_id, get_output_dir, link_or_copy
+
+
+def _is_postprocessing_error(error: Exception) -> bool:
+    """
+    Whether a download error came from post-processing (the video itself may be on disk).
+    
+    YoutubeDL reports a failed post-processor as a DownloadError whose exc_info holds
+    the PostProcessingError, so the check is by type rather than by scanning the message.
+    """
+    if isinstance(error, PostProcessingError):
+        return True
+    if isinstance(error, DownloadError):
+        cause = error.exc_info[1] if error.exc_info else None
+        if isinstance(cause, PostProcessingError):
+            return True
+        # Older yt-dlp versions only report it in the message; "Expecting value" is a
+        # fixup reading an empty JSON sidecar
+        return 'Postprocessing' in error.msg or 'Expecting value' in error.msg
+    return False
 
 
 def download_video(url: str, force: bool = False) -> Tuple[Path, Dict, str]:
@@ -50,16 +71,14 @@ def download_video(url: str, force: bool = False) -> Tuple[Path, Dict, str]:
         if video_path.exists():
             # If video exists, we can use it even without metadata
             if meta_path.exists():
-                import json
                 try:
-                    with open(meta_path, 'r', encoding='utf-8') as f:
-                        content = f.read().strip()
-                        if content:
-                            metadata = json.loads(content)
-                        else:
-                            # Empty file, create basic metadata
-                            metadata = {'url': url, 'video_id': video_id}
-                except (json.JSONDecodeError, ValueError):
+                    content = meta_path.read_bytes().strip()
+                    if content:
+                        metadata = orjson.loads(content)
+                    else:
+                        # Empty file, create basic metadata
+                        metadata = {'url': url, 'video_id': video_id}
+                except ValueError:  # orjson.JSONDecodeError is a ValueError
                     # Corrupted metadata file, create basic metadata
                     metadata = {'url': url, 'video_id': video_id}
             else:
@@ -88,29 +107,38 @@ def download_video(url: str, force: bool = False) -> Tuple[Path, Dict, str]:
     except:
         fixup_patched = False
     
-    # Track downloaded file via progress hook
+    # Track downloaded file (and the video info it came with) via progress hook
     saved_video_path = None
+    hook_info = None
     
     def progress_hook(d):
         """Hook to save video path when download completes."""
-        nonlocal saved_video_path
+        nonlocal saved_video_path, hook_info
         status = d.get('status')
         filename = d.get('filename')
         
         if status == 'finished':
+            # Keep the extracted info so a later post-processing error doesn't need another probe
+            hook_info = d.get('info_dict') or hook_info
             if filename:
                 source_file = Path(filename)
                 if source_file.exists():
                     saved_video_path = source_file
-                    # Immediately copy to our target location to prevent deletion
+                    # Immediately link to our target location to prevent deletion
+                    # (a hard link, so the video's bytes aren't copied)
                     try:
                         video_path.parent.mkdir(parents=True, exist_ok=True)
                         if not video_path.exists():
-                            shutil.copy2(source_file, video_path)
+                            link_or_copy(source_file, video_path)
                             print(f"✓ Video saved via progress hook: {video_path.name}")
                     except Exception as copy_error:
                         print(f"⚠ Error copying video: {copy_error}")
     
+    def postprocessor_hook(d):
+        """Hook to keep the video info as each post-processor starts (before it can fail)."""
+        nonlocal hook_info
+        hook_info = d.get('info_dict') or hook_info
+    
     # Use HIGHEST quality video for slide extraction (need readable text)
     # Format 160 = 256x144 (too low), we need at least 480p
     # Prefer combined formats (no merging needed) but exclude low quality
@@ -123,6 +151,7 @@ def download_video(url: str, force: bool = False) -> Tuple[Path, Dict, str]:
         'postprocessors': [],
         'nopostoverwrites': True,
         'progress_hooks': [progress_hook],
+        'postprocessor_hooks': [postprocessor_hook],
         # Use android client to bypass bot detection (most reliable method)
         'extractor_args': {'youtube': {'player_client': ['android']}},
     }
@@ -140,18 +169,21 @@ def download_video(url: str, force: bool = False) -> Tuple[Path, Dict, str]:
                 print(f"   Download completed, checking for file...")
             except Exception as download_error:
                 # Handle post-processing errors (same as audio downloader)
-                error_str = str(download_error)
-                print(f"   Download error: {error_str}")
-                if "Postprocessing" in error_str or "postprocess" in error_str.lower() or "FixupM4a" in error_str or "Expecting value" in error_str:
+                print(f"   Download error: {download_error}")
+                if _is_postprocessing_error(download_error):
                     # Post-processing error is expected - try to get info without downloading
                     print("⚠ Post-processing error (video may still be downloaded)...")
-                    try:
-                        # Use a fresh yt-dlp instance to get info
-                        temp_ydl = yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True})
-                        info = temp_ydl.extract_info(url, download=False)
-                    except Exception as info_error:
-                        print(f"⚠ Could not extract video info: {info_error}")
-                        info = {}
+                    if hook_info:
+                        # Info already extracted for the download - no second round-trip to YouTube
+                        info = hook_info
+                    else:
+                        try:
+                            # Use a fresh yt-dlp instance to get info
+                            temp_ydl = yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True})
+                            info = temp_ydl.extract_info(url, download=False)
+                        except Exception as info_error:
+                            print(f"⚠ Could not extract video info: {info_error}")
+                            info = {}
                 else:
                     raise
             
@@ -176,20 +208,20 @@ def download_video(url: str, force: bool = False) -> Tuple[Path, Dict, str]:
                 downloaded_video = saved_video_path
             
             if not video_path.exists() and not downloaded_video:
-                # Look for downloaded file
-                video_files = list(output_dir.glob("*.mp4"))
-                if video_files:
-                    downloaded_video = video_files[0]
-                else:
-                    # Check for file without extension
-                    potential_file = output_dir / video_id
-                    if potential_file.exists():
-                        downloaded_video = potential_file
-                    else:
-                        # Check for any video-like file
-                        all_files = [f for f in output_dir.iterdir() if f.is_file() and f.name != 'meta.json' and f.name != 'audio.m4a']
-                        if all_files:
-                            downloaded_video = all_files[0]
+                # Look for downloaded file: an .mp4, else the file without extension,
+                # else any video-like file (one directory scan for all three)
+                first_mp4 = no_extension = first_other = None
+                with os.scandir(output_dir) as entries:
+                    for entry in entries:
+                        if entry.name in ('meta.json', 'audio.m4a') or not entry.is_file():
+                            continue
+                        if entry.name.endswith('.mp4'):
+                            first_mp4 = first_mp4 or Path(entry.path)
+                        elif entry.name == video_id:
+                            no_extension = Path(entry.path)
+                        else:
+                            first_other = first_other or Path(entry.path)
+                downloaded_video = first_mp4 or no_extension or first_other
             
             if downloaded_video and downloaded_video != video_path:
                 if not video_path.exists():
@@ -205,9 +237,7 @@ def download_video(url: str, force: bool = False) -> Tuple[Path, Dict, str]:
                 metadata = {'url': url, 'video_id': video_id}
             
             try:
-                with open(meta_path, 'w', encoding='utf-8') as f:
-                    import json
-                    json.dump(metadata, f, indent=2, ensure_ascii=False)
+                meta_path.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
             except Exception as meta_error:
                 print(f"⚠ Warning: Could not save metadata: {meta_error}")
             
@@ -258,9 +288,7 @@ def download_video(url: str, force: bool = False) -> Tuple[Path, Dict, str]:
             if not metadata:
                 metadata = {'url': url, 'video_id': video_id}
             try:
-                with open(meta_path, 'w', encoding='utf-8') as f:
-                    import json
-                    json.dump(metadata, f, indent=2, ensure_ascii=False)
+                meta_path.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
             except:
                 pass
         else:
@@ -1,6 +1,6 @@
 """Writer for JSON format."""
 
-import json
+import orjson
 from pathlib import Path
 from yt2txt.models import Transcript
 
@@ -24,6 +24,5 @@ def write_json(transcript: Transcript, output_path: Path) -> None:
         ]
     }
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
+    # orjson serializes straight to UTF-8 bytes (non-ASCII kept as-is)
+    output_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
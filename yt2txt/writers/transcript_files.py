@@ -0,0 +1,35 @@
+"""Write all transcript formats (JSON, TXT, SRT) for a video."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from yt2txt.models import Transcript
+from yt2txt.writers.json_writer import write_json
+from yt2txt.writers.srt_writer import write_srt
+from yt2txt.writers.txt_writer import write_txt
+
+
+def write_transcript_files(transcript: Transcript, output_dir: Path, skip_existing: frozenset = frozenset()) -> None:
+    """
+    Write the JSON, TXT and SRT transcript files to output_dir (in parallel).
+    
+    Args:
+        transcript: Transcript to write
+        output_dir: Directory the files are written to
+        skip_existing: Names of files that are already up to date and left alone
+    """
+    writes = [
+        (writer, path) for writer, path in (
+            (write_json, output_dir / "transcript.json"),
+            (write_txt, output_dir / "transcript_with_timestamps.txt"),
+            (write_srt, output_dir / "transcript.srt"),
+        )
+        if path.name not in skip_existing
+    ]
+    if not writes:
+        return
+    
+    # Each writer is independent file I/O, so threads overlap the writes
+    with ThreadPoolExecutor(max_workers=len(writes)) as executor:
+        futures = [executor.submit(writer, transcript, path) for writer, path in writes]
+        for future in futures:
+            future.result()